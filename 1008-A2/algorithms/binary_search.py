@@ -3,10 +3,13 @@ from typing import TypeVar
 
 T = TypeVar("T")
 
-def binary_search(l: list[T], item: T) -> int:
+def binary_search(l: list[T], item: T, key=None) -> int:
     """
     Utilise the binary search algorithm to find the index where a particular element would be stored.
 
+    The `key` kwarg allows you to search a list sorted by a custom key.
+    The key of `item` is computed only once.
+
     :return: The index at which either:
         * This item is located, or
         * Where this item would be inserted to preserve the ordering.
@@ -15,7 +18,9 @@ def binary_search(l: list[T], item: T) -> int:
     Best Case Complexity: O(1), when middle index contains item.
     Worst Case Complexity: O(log(N)), where N is the length of l.
     """
-    return _binary_search_aux(l, item, 0, len(l))
+    if key is None:
+        return _binary_search_aux(l, item, 0, len(l))
+    return _binary_search_key(l, key(item), key, 0, len(l))
 
 def _binary_search_aux(l: list[T], item: T, lo: int, hi: int) -> int:
     """
@@ -35,3 +40,20 @@ def _binary_search_aux(l: list[T], item: T, lo: int, hi: int) -> int:
     elif l[mid] == item:
         return mid
     raise ValueError(f"Comparison operator poorly implemented {item} and {l[mid]} cannot be compared.")
+
+def _binary_search_key(l: list[T], item_key, key, lo: int, hi: int) -> int:
+    """
+    Iterative binary search comparing key(l[mid]) against the precomputed item_key.
+    """
+    while lo < hi:
+        mid = (hi + lo) // 2
+        mid_key = key(l[mid])
+        if mid_key > item_key:
+            hi = mid
+        elif mid_key < item_key:
+            lo = mid + 1
+        elif mid_key == item_key:
+            return mid
+        else:
+            raise ValueError(f"Comparison operator poorly implemented {item_key} and {mid_key} cannot be compared.")
+    return lo
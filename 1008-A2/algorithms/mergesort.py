@@ -9,33 +9,59 @@ def merge(l1: list[T], l2: list[T], key=lambda x:x) -> list[T]:
     containing all elements from the smaller lists.
 
     The `key` kwarg allows you to define a custom sorting order.
+    The key of each element is computed only once.
 
     :pre: Both l1 and l2 are sorted, and contain comparable elements.
     :complexity: Best/Worst Case O(n * comp(T)), n = len(l1)+len(l2)
     :returns: The sorted list.
     """
+    _, new_list = _merge_keyed(
+        [key(x) for x in l1], l1,
+        [key(x) for x in l2], l2,
+    )
+    return new_list
+
+def mergesort(l: list[T], key=lambda x:x) -> list[T]:
+    """
+    Sort a list using the mergesort operation.
+    Keys are computed once per element up front, rather than on every comparison.
+    :complexity: Best/Worst Case O(NlogN * comp(T))
+    """
+    if len(l) <= 1:
+        return l
+    _, items = _mergesort_keyed([key(x) for x in l], l)
+    return items
+
+def _mergesort_keyed(keys: list, items: list[T]) -> tuple[list, list[T]]:
+    """
+    Sorts items by the parallel list of keys, returning both lists sorted.
+    """
+    if len(items) <= 1:
+        return keys, items
+    break_index = (len(items)+1) // 2
+    k1, l1 = _mergesort_keyed(keys[:break_index], items[:break_index])
+    k2, l2 = _mergesort_keyed(keys[break_index:], items[break_index:])
+    return _merge_keyed(k1, l1, k2, l2)
+
+def _merge_keyed(k1: list, l1: list[T], k2: list, l2: list[T]) -> tuple[list, list[T]]:
+    """
+    Merges two sorted lists, comparing their parallel precomputed keys.
+    """
+    new_keys = []
     new_list = []
     cur_left = 0
     cur_right = 0
     while cur_left < len(l1) and cur_right < len(l2):
-        if key(l1[cur_left]) <= key(l2[cur_right]):
+        if k1[cur_left] <= k2[cur_right]:
+            new_keys.append(k1[cur_left])
             new_list.append(l1[cur_left])
             cur_left += 1
         else:
+            new_keys.append(k2[cur_right])
             new_list.append(l2[cur_right])
             cur_right += 1
+    new_keys += k1[cur_left:]
+    new_keys += k2[cur_right:]
     new_list += l1[cur_left:]
     new_list += l2[cur_right:]
-    return new_list
-
-def mergesort(l: list[T], key=lambda x:x) -> list[T]:
-    """
-    Sort a list using the mergesort operation.
-    :complexity: Best/Worst Case O(NlogN * comp(T))
-    """
-    if len(l) <= 1:
-        return l
-    break_index = (len(l)+1) // 2
-    l1 = mergesort(l[:break_index], key=key)
-    l2 = mergesort(l[break_index:], key=key)
-    return merge(l1, l2, key=key)
+    return new_keys, new_list
@@ -0,0 +1,99 @@
+from __future__ import annotations
+import operator
+from functools import lru_cache
+from typing import Callable, Mapping
+
+OPERATORS: dict[str, Callable[[float, float], float]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
+
+class RPNExpression:
+    """
+    A Reverse Polish Notation expression, parsed once into a list of instructions.
+
+    Tokens are separated by whitespace and are either numbers, one of OPERATORS,
+    or variable names (identifiers) looked up when the expression is evaluated.
+    Expressions without variables are evaluated once, at compile time.
+    Results for variable expressions are memoised on the variable values.
+    """
+
+    MAX_CACHE = 1024
+
+    def __init__(self, expression: str) -> None:
+        """
+        :complexity: O(T) where T is the number of tokens.
+        :raises ValueError: when the expression is malformed.
+        """
+        self.expression = expression
+        # Each instruction is (operator, None) or (None, operand), operands being numbers or variable names.
+        self.instructions: list[tuple[Callable | None, float | str | None]] = []
+        names = []
+        depth = 0
+        for token in expression.split():
+            if token in OPERATORS:
+                if depth < 2:
+                    raise ValueError(f"Not enough operands for {token!r} in {expression!r}")
+                self.instructions.append((OPERATORS[token], None))
+                depth -= 1
+                continue
+            try:
+                self.instructions.append((None, float(token)))
+            except ValueError:
+                if not token.isidentifier():
+                    raise ValueError(f"Invalid token {token!r} in {expression!r}")
+                self.instructions.append((None, token))
+                if token not in names:
+                    names.append(token)
+            depth += 1
+        if depth != 1:
+            raise ValueError(f"Expression {expression!r} does not reduce to a single value")
+
+        self.variables: tuple[str, ...] = tuple(names)
+        self.constant: float | None = None if self.variables else self._run({})
+        self._cache: dict[tuple, float] = {}
+
+    def evaluate(self, variables: Mapping[str, float] | None = None) -> float:
+        """
+        :complexity best: O(1) for constant expressions or memoised variable values.
+        :complexity worst: O(T) where T is the number of tokens.
+        :raises KeyError: when a variable is missing.
+        """
+        if self.constant is not None:
+            return self.constant
+        if variables is None:
+            variables = {}
+        key = tuple(variables[name] for name in self.variables)
+        result = self._cache.get(key)
+        if result is None:
+            if len(self._cache) >= self.MAX_CACHE:
+                self._cache.clear()
+            result = self._cache[key] = self._run(variables)
+        return result
+
+    def _run(self, variables: Mapping[str, float]) -> float:
+        stack = []
+        for op, operand in self.instructions:
+            if op is not None:
+                b = stack.pop()
+                a = stack.pop()
+                stack.append(op(a, b))
+            elif type(operand) == str:
+                stack.append(variables[operand])
+            else:
+                stack.append(operand)
+        return stack.pop()
+
+
+@lru_cache(maxsize=128)
+def compile_rpn(expression: str) -> RPNExpression:
+    """
+    Returns the compiled form of an expression, reusing earlier compilations.
+
+    :complexity best: O(len(expression)) to look up a previously compiled expression.
+    :raises ValueError: when the expression is malformed.
+    """
+    return RPNExpression(expression)
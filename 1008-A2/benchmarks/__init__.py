@@ -0,0 +1,5 @@
+"""
+Benchmark scripts, run from the project root, e.g.
+
+    python -m benchmarks.bench_organiser
+"""
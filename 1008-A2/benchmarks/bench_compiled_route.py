@@ -0,0 +1,56 @@
+"""
+Compares Route.follow_path against CompiledRoute.follow_path on a large random route.
+
+    python -m benchmarks.bench_compiled_route [computers] [repeats]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from compiled_route import CompiledRoute
+from computer import Computer
+from route import Route
+from virus import TopVirus, BottomVirus, LazyVirus, RiskAverseVirus
+
+
+def make_route(n: int, seed: int = 0) -> Route:
+    """
+    Builds a route of n computers, adding a branch roughly every 10 computers.
+    """
+    rng = random.Random(seed)
+    route = Route(None)
+    pending = []
+    for i in range(n):
+        route = route.add_computer_before(Computer(f"c{i}", rng.randrange(10), rng.randrange(100), rng.random()))
+        if rng.random() < 0.1:
+            pending.append(route)
+            if len(pending) == 2:
+                top, bottom = pending
+                pending = []
+                route = Route(None).add_empty_branch_before()
+                route.store.top, route.store.bottom = top, bottom
+    return route
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    route = make_route(n)
+
+    start = time.perf_counter()
+    compiled = CompiledRoute(route)
+    print(f"{n} computers, {len(compiled)} nodes, compiled in {time.perf_counter() - start:.3f}s")
+
+    for virus_type in (TopVirus, BottomVirus, LazyVirus, RiskAverseVirus):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            route.follow_path(virus_type())
+        plain = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            compiled.follow_path(virus_type())
+        fast = time.perf_counter() - start
+        print(f"{virus_type.__name__:>16}: route {plain:7.3f}s  compiled {fast:7.3f}s  speedup {plain / fast:5.2f}x")
@@ -0,0 +1,45 @@
+"""
+Compares the memory used per computer by Computer, FrozenComputer and ComputerTable.
+
+    python -m benchmarks.bench_computer_memory [count]
+"""
+from __future__ import annotations
+
+import sys
+import tracemalloc
+
+from computer import Computer, FrozenComputer
+from computer_table import ComputerTable
+
+
+def measure(build) -> int:
+    """
+    Returns the bytes still allocated by the object that build() returns.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    # Names and field values are created up front so every layout shares them.
+    names = [f"computer-{i}" for i in range(count)]
+    difficulties = [i % 1000 for i in range(count)]
+    values = [i % 5000 for i in range(count)]
+    risks = [(i % 100) / 100 for i in range(count)]
+    rows = list(zip(names, difficulties, values, risks))
+
+    layouts = {
+        "Computer": lambda: [Computer(*row) for row in rows],
+        "FrozenComputer": lambda: [FrozenComputer(*row) for row in rows],
+        "ComputerTable": lambda: ComputerTable(Computer(*row) for row in rows),
+    }
+    print(f"{count} computers")
+    for label, build in layouts.items():
+        used = measure(build)
+        print(f"{label:>15}: {used / count:8.1f} bytes per computer")
@@ -0,0 +1,32 @@
+"""
+Calls the per-key1 iterators and lists for every top-level key of a DoubleKeyTable.
+
+Each key1 has a few key2s, so the time per key1 should not depend on the number of key1s.
+
+    python -m benchmarks.bench_double_key_iteration [key1s]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from double_key_table import DoubleKeyTable
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    key1s = [f"virus-{i}" for i in range(n)]
+    table = DoubleKeyTable(fast_hash=True)
+    for key1 in key1s:
+        for j in range(3):
+            table[key1, f"computer-{j}"] = j
+
+    print(f"{n} key1s, top-level table size {table.table_size}")
+    for name, method in (("iter_keys", table.iter_keys), ("iter_values", table.iter_values),
+                         ("keys", table.keys), ("values", table.values)):
+        start = time.perf_counter()
+        for key1 in key1s:
+            for _ in method(key1):
+                pass
+        elapsed = time.perf_counter() - start
+        print(f"  {name:>11}: {elapsed:8.3f}s total  {elapsed / n * 1e6:8.2f}us per key1")
@@ -0,0 +1,35 @@
+"""
+Measures DoubleKeyTable __setitem__ and __getitem__ throughput.
+
+    python -m benchmarks.bench_double_key_table [key1s] [key2s_per_key1]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from double_key_table import DoubleKeyTable
+
+
+def run(key1s: int, key2s: int, fast_hash: bool) -> str:
+    pairs = [(f"virus-{i}", f"computer-{j}") for i in range(key1s) for j in range(key2s)]
+    table = DoubleKeyTable(fast_hash=fast_hash)
+
+    start = time.perf_counter()
+    for pair in pairs:
+        table[pair] = 0
+    set_rate = len(pairs) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for pair in pairs:
+        table[pair]
+    get_rate = len(pairs) / (time.perf_counter() - start)
+    return f"set {set_rate / 1e3:8.1f}k ops/s  get {get_rate / 1e3:8.1f}k ops/s"
+
+
+if __name__ == "__main__":
+    key1s = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    key2s = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(f"{key1s} key1s x {key2s} key2s")
+    for fast_hash in (False, True):
+        print(f"  fast_hash={fast_hash!s:5}: {run(key1s, key2s, fast_hash)}")
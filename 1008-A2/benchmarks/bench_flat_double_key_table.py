@@ -0,0 +1,56 @@
+"""
+Compares FlatDoubleKeyTable with the nested DoubleKeyTable (both with fast_hash).
+
+Reports insert and point lookup throughput, per-key1 keys() time and the memory held by each table.
+
+    python -m benchmarks.bench_flat_double_key_table [key1s] [key2s_per_key1]
+"""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+from double_key_table import DoubleKeyTable
+from flat_double_key_table import FlatDoubleKeyTable
+
+
+def run(make, key1s: list[str], key2s: list[str]) -> str:
+    pairs = [(key1, key2) for key1 in key1s for key2 in key2s]
+
+    start = time.perf_counter()
+    table = make()
+    for pair in pairs:
+        table[pair] = 0
+    set_rate = len(pairs) / (time.perf_counter() - start)
+
+    # Built again while tracing, since tracing slows every allocation down.
+    tracemalloc.start()
+    traced = make()
+    for pair in pairs:
+        traced[pair] = 0
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del traced
+
+    start = time.perf_counter()
+    for pair in pairs:
+        table[pair]
+    get_rate = len(pairs) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for key1 in key1s:
+        table.keys(key1)
+    group = (time.perf_counter() - start) / len(key1s)
+    return (f"set {set_rate / 1e3:7.1f}k ops/s  get {get_rate / 1e3:7.1f}k ops/s  "
+            f"keys(key1) {group * 1e6:7.2f}us  memory {memory / 2 ** 20:7.1f}MiB")
+
+
+if __name__ == "__main__":
+    n1 = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n2 = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    key1s = [f"virus-{i}" for i in range(n1)]
+    key2s = [f"computer-{j}" for j in range(n2)]
+    print(f"{n1} key1s x {n2} key2s")
+    print(f"  nested: {run(lambda: DoubleKeyTable(fast_hash=True), key1s, key2s)}")
+    print(f"  flat:   {run(FlatDoubleKeyTable, key1s, key2s)}")
@@ -0,0 +1,42 @@
+"""
+Compares LinearProbeTable deletion strategies under interleaved inserts and deletes.
+
+Each table has a single, fixed size, so it stays at the target load factor.
+
+    python -m benchmarks.bench_hash_table_churn [table_size] [operations]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from data_structures.hash_table import LinearProbeTable
+
+
+def churn(table_size: int, load: float, operations: int, tombstones: bool, seed: int = 0) -> float:
+    rng = random.Random(seed)
+    table = LinearProbeTable([table_size], tombstones=tombstones)
+    live = [f"key-{i}" for i in range(int(table_size * load))]
+    for key in live:
+        table[key] = 0
+    next_key = len(live)
+
+    start = time.perf_counter()
+    for _ in range(operations):
+        index = rng.randrange(len(live))
+        del table[live[index]]
+        live[index] = f"key-{next_key}"
+        next_key += 1
+        table[live[index]] = 0
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    table_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1543
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    print(f"table size {table_size}, {operations} delete+insert pairs")
+    for load in (0.25, 0.5, 0.75, 0.9):
+        cluster = churn(table_size, load, operations, tombstones=False)
+        tomb = churn(table_size, load, operations, tombstones=True)
+        print(f"load {load:4.2f}: reinsert cluster {cluster:7.3f}s  tombstones {tomb:7.3f}s  speedup {cluster / tomb:5.2f}x")
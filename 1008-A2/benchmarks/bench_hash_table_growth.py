@@ -0,0 +1,59 @@
+"""
+Grows a LinearProbeTable from empty to n keys one insert at a time.
+
+Reports the number of resizes, the total time spent resizing, the total
+build time and the peak memory traced while building.
+
+    python -m benchmarks.bench_hash_table_growth [keys] [fast_hash]
+"""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+from data_structures.hash_table import LinearProbeTable
+
+
+class TimedLPT(LinearProbeTable):
+    """
+    Records the time spent in _resize.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.resizes = 0
+        self.resize_time = 0.0
+        super().__init__(*args, **kwargs)
+
+    def _resize(self, size_index: int) -> None:
+        start = time.perf_counter()
+        super()._resize(size_index)
+        self.resize_time += time.perf_counter() - start
+        self.resizes += 1
+
+
+def grow(keys: list[str], fast_hash: bool) -> TimedLPT:
+    table = TimedLPT(fast_hash=fast_hash)
+    for key in keys:
+        table[key] = 0
+    return table
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    fast_hash = sys.argv[2].lower() in ("1", "true", "yes") if len(sys.argv) > 2 else True
+    keys = [f"computer-{i}" for i in range(n)]
+
+    start = time.perf_counter()
+    table = grow(keys, fast_hash)
+    total = time.perf_counter() - start
+    print(f"{n} keys, fast_hash={fast_hash}, final table size {table.table_size}")
+    print(f"{table.resizes} resizes taking {table.resize_time:.3f}s of {total:.3f}s")
+    del table
+
+    # Traced separately, since tracing slows every allocation down.
+    tracemalloc.start()
+    table = grow(keys, fast_hash)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"peak memory {peak / 2 ** 20:.1f}MiB")
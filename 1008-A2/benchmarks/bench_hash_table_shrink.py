@@ -0,0 +1,42 @@
+"""
+Compares LinearProbeTable with and without shrink-on-delete after a bulk delete.
+
+Fills a table, deletes all but a fraction of the keys, then reports the table size,
+the memory held by the table and the time taken by keys() and values() scans.
+
+    python -m benchmarks.bench_hash_table_shrink [keys] [keep]
+"""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+from data_structures.hash_table import LinearProbeTable
+
+
+def run(n: int, keep: float, min_load: float, scans: int = 20) -> str:
+    keys = [f"computer-{i}" for i in range(n)]
+    tracemalloc.start()
+    table = LinearProbeTable(fast_hash=True, min_load=min_load)
+    for key in keys:
+        table[key] = 0
+    for key in keys[int(n * keep):]:
+        del table[key]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(scans):
+        table.keys()
+        table.values()
+    scan = (time.perf_counter() - start) / scans
+    return f"table size {table.table_size:8d}  memory {memory / 1024:9.1f}KiB  scan {scan * 1e3:8.3f}ms"
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    keep = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+    print(f"{n} keys, keeping {keep:.0%} after the bulk delete")
+    print(f"  no shrink:    {run(n, keep, 0)}")
+    print(f"  min_load {LinearProbeTable.MIN_LOAD}: {run(n, keep, LinearProbeTable.MIN_LOAD)}")
@@ -0,0 +1,55 @@
+"""
+Deletes most keys from an InfiniteHashTable of deep keys.
+
+Keys share long prefixes, so they sit many tables down. Reports the delete time,
+the number of tables left and the memory held by the table before and after.
+
+    python -m benchmarks.bench_infinite_hash_table_delete [keys] [keep]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+import tracemalloc
+
+from infinite_hash_table import InfiniteHashTable
+
+
+def count_tables(table: InfiniteHashTable) -> int:
+    return 1 + sum(count_tables(item) for item in table.array if isinstance(item, InfiniteHashTable))
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    keep = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    rng = random.Random(0)
+    keys = [f"region-{rng.randint(0, 9)}/rack-{rng.randint(0, 99):02d}/server-{i:06d}" for i in range(n)]
+    doomed = keys[:]
+    rng.shuffle(doomed)
+    doomed = doomed[int(n * keep):]
+
+    table = InfiniteHashTable()
+    for key in keys:
+        table[key] = 0
+    tables_before = count_tables(table)
+    start = time.perf_counter()
+    for key in doomed:
+        del table[key]
+    elapsed = time.perf_counter() - start
+    tables_after = count_tables(table)
+    del table
+
+    # Repeated while tracing, since tracing slows every allocation down.
+    tracemalloc.start()
+    table = InfiniteHashTable()
+    for key in keys:
+        table[key] = 0
+    before = tracemalloc.get_traced_memory()[0]
+    for key in doomed:
+        del table[key]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{n} keys, deleting {len(doomed)}: {elapsed:.3f}s ({elapsed / len(doomed) * 1e6:.2f}us per delete)")
+    print(f"tables {tables_before} -> {tables_after}, memory {before / 2 ** 20:.1f}MiB -> {after / 2 ** 20:.1f}MiB")
@@ -0,0 +1,62 @@
+"""
+Compares the full (TABLE_SIZE slots per table) and sparse (occupied slots only) InfiniteHashTable layouts.
+
+Reports the memory per key and the lookup, insert and delete times for each layout,
+with and without path compression.
+
+    python -m benchmarks.bench_infinite_hash_table_layout [keys]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+import tracemalloc
+
+from infinite_hash_table import InfiniteHashTable
+
+
+def build(keys: list[str], compressed: bool, sparse: bool) -> InfiniteHashTable:
+    table = InfiniteHashTable(compressed=compressed, sparse=sparse)
+    for key in keys:
+        table[key] = 0
+    return table
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = random.Random(0)
+    workloads = {
+        "random words": list({"".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 10))): 0
+                              for _ in range(n)}),
+        "hierarchical": list({f"region-{rng.randint(0, 9)}/rack-{rng.randint(0, 99):02d}/server-{i:06d}": 0
+                              for i in range(n)}),
+    }
+    for name, keys in workloads.items():
+        print(f"{name}: {len(keys)} keys")
+        lookups = keys[:]
+        rng.shuffle(lookups)
+        for compressed in (False, True):
+            for sparse in (False, True):
+                start = time.perf_counter()
+                table = build(keys, compressed, sparse)
+                insert = time.perf_counter() - start
+                start = time.perf_counter()
+                for key in lookups:
+                    table[key]
+                lookup = time.perf_counter() - start
+                start = time.perf_counter()
+                for key in lookups:
+                    del table[key]
+                delete = time.perf_counter() - start
+                del table
+
+                # Built again while tracing, since tracing slows every allocation down.
+                tracemalloc.start()
+                table = build(keys, compressed, sparse)
+                memory = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+                del table
+                layout = f"{'compressed' if compressed else 'plain'}, {'sparse' if sparse else 'full'}"
+                print(f"  {layout:18}  {memory / len(keys):7.0f}B per key  lookup {lookup / len(keys) * 1e6:5.2f}us"
+                      f"  insert {insert / len(keys) * 1e6:5.2f}us  delete {delete / len(keys) * 1e6:5.2f}us")
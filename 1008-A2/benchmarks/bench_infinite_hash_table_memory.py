@@ -0,0 +1,56 @@
+"""
+Compares the plain and path-compressed (radix) InfiniteHashTable on keys with long shared prefixes.
+
+Reports the number of tables, the memory held, the average location length and the lookup time.
+
+    python -m benchmarks.bench_infinite_hash_table_memory [keys]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+import tracemalloc
+
+from infinite_hash_table import InfiniteHashTable
+
+
+def count_tables(table: InfiniteHashTable) -> int:
+    return 1 + sum(count_tables(item) for item in table.array if isinstance(item, InfiniteHashTable))
+
+
+def build(keys: list[str], compressed: bool) -> InfiniteHashTable:
+    table = InfiniteHashTable(compressed=compressed)
+    for key in keys:
+        table[key] = 0
+    return table
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = random.Random(0)
+    workloads = {
+        "server-rack-NNNN": [f"server-rack-{i:04d}" for i in range(min(n, 10_000))],
+        "hierarchical": list({f"region-{rng.randint(0, 9)}/rack-{rng.randint(0, 99):02d}/server-{i:06d}": 0
+                              for i in range(n)}),
+    }
+    for name, keys in workloads.items():
+        print(f"{name}: {len(keys)} keys")
+        for compressed in (False, True):
+            table = build(keys, compressed)
+            tables = count_tables(table)
+            depth = sum(len(table.get_location(key)) for key in keys) / len(keys)
+            start = time.perf_counter()
+            for key in keys:
+                table[key]
+            elapsed = time.perf_counter() - start
+            del table
+
+            # Built again while tracing, since tracing slows every allocation down.
+            tracemalloc.start()
+            table = build(keys, compressed)
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del table
+            print(f"  {'compressed' if compressed else 'plain':10}  tables {tables:7d}  memory {memory / 2 ** 20:7.1f}MiB"
+                  f"  depth {depth:5.2f}  lookup {elapsed / len(keys) * 1e6:.2f}us")
@@ -0,0 +1,45 @@
+"""
+Compares ComputerOrganiser backends on a stream of small batches.
+
+    python -m benchmarks.bench_organiser [total] [batch]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from computer import Computer
+from computer_organiser import ComputerOrganiser
+
+
+def make_computers(n: int, seed: int = 0) -> list[Computer]:
+    rng = random.Random(seed)
+    return [
+        Computer(f"c{i}", rng.randrange(100), rng.randrange(1000), round(rng.random(), 3))
+        for i in range(n)
+    ]
+
+
+def run(backend: str, computers: list[Computer], batch: int) -> tuple[float, float]:
+    organiser = ComputerOrganiser(backend)
+    start = time.perf_counter()
+    for i in range(0, len(computers), batch):
+        organiser.add_computers(computers[i:i + batch])
+    add_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for computer in computers[::max(1, len(computers) // 1000)]:
+        organiser.cur_position(computer)
+    rank_time = time.perf_counter() - start
+    return add_time, rank_time
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    computers = make_computers(total)
+    print(f"{total} computers in batches of {batch}")
+    for backend in ComputerOrganiser.BACKENDS:
+        add_time, rank_time = run(backend, computers, batch)
+        print(f"{backend:>8}: add {add_time:8.3f}s  1000 ranks {rank_time * 1000:8.2f}ms")
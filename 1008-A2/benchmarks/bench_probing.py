@@ -0,0 +1,58 @@
+"""
+Compares probing strategies for LinearProbeTable at several load factors.
+
+Reports average and maximum probe length of successful lookups, lookup
+latency and the memory used by the table. Each table has a single, fixed
+size, so it stays at the target load factor.
+
+    python -m benchmarks.bench_probing [table_size]
+"""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+from data_structures.hash_table import LinearProbeTable, FullError, TOMBSTONE
+from data_structures.probing import STRATEGIES
+
+
+def probe_length(table: LinearProbeTable, key: str) -> int:
+    """
+    Returns the number of slots visited to find key.
+    """
+    for length, position in enumerate(table.probing.sequence(table.hash(key), key, table.table_size), 1):
+        item = table.array[position]
+        if item is not None and item is not TOMBSTONE and item[0] == key:
+            return length
+    raise KeyError(key)
+
+
+def run(strategy, table_size: int, load: float) -> str:
+    keys = [f"computer-{i}" for i in range(int(table_size * load))]
+    tracemalloc.start()
+    table = LinearProbeTable([table_size], probing=strategy)
+    try:
+        for key in keys:
+            table[key] = 0
+    except FullError:
+        tracemalloc.stop()
+        return "full"
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    lengths = [probe_length(table, key) for key in keys]
+    start = time.perf_counter()
+    for key in keys:
+        table[key]
+    latency = (time.perf_counter() - start) / len(keys)
+    return (f"avg probe {sum(lengths) / len(lengths):6.2f}  max probe {max(lengths):5d}  "
+            f"lookup {latency * 1e6:6.2f}us  memory {memory / 1024:8.1f}KiB")
+
+
+if __name__ == "__main__":
+    table_size = int(sys.argv[1]) if len(sys.argv) > 1 else 6151
+    print(f"table size {table_size}")
+    for load in (0.25, 0.5, 0.75, 0.9):
+        for strategy in STRATEGIES:
+            print(f"load {load:4.2f} {type(strategy).__name__:>16}: {run(strategy, table_size, load)}")
@@ -0,0 +1,154 @@
+from __future__ import annotations
+from array import array
+from typing import TYPE_CHECKING
+
+from computer import Computer
+from route import Route, RouteSeries, RouteSplit
+from branch_decision import BranchDecision
+
+if TYPE_CHECKING:
+    from virus import VirusType
+
+
+class CompiledRoute:
+    """
+    A Route flattened into parallel arrays, one entry per distinct Route object.
+
+    For node i:
+        - kinds[i] is EMPTY, SERIES or SPLIT.
+        - computer_index[i] indexes `computers` (series only, -1 otherwise).
+        - top[i], bottom[i] are the branch nodes (split only, -1 otherwise).
+        - following[i] is the node after this one (-1 for empty routes).
+        - routes[i] is the original Route, handed to VirusType.select_branch.
+
+    Routes shared between several parents are compiled once.
+    Compile once, then call follow_path as many times as needed.
+
+    Pickling keeps only the arrays and computers; `routes` is rebuilt without
+    recursion on unpickling, so arbitrarily long routes can be sent to other processes.
+    """
+
+    EMPTY = 0
+    SERIES = 1
+    SPLIT = 2
+
+    def __init__(self, route: Route) -> None:
+        """
+        :complexity: O(N) where N is the number of route components.
+        """
+        self.kinds = array("b")
+        self.computer_index = array("l")
+        self.top = array("l")
+        self.bottom = array("l")
+        self.following = array("l")
+        self.is_final = array("b")
+        self.routes: list[Route] = []
+        self.computers: list[Computer] = []
+        self._compile(route)
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["routes"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._rebuild_routes()
+
+    def _rebuild_routes(self) -> None:
+        """
+        Recreates one Route per node from the arrays, sharing routes exactly as the original did.
+
+        :complexity: O(N) where N is the number of nodes.
+        """
+        routes = self.routes = [Route(None) for _ in range(len(self.kinds))]
+        for node, kind in enumerate(self.kinds):
+            if kind == self.SERIES:
+                computer = self.computers[self.computer_index[node]]
+                routes[node].store = RouteSeries(computer, routes[self.following[node]])
+            elif kind == self.SPLIT:
+                routes[node].store = RouteSplit(
+                    routes[self.top[node]], routes[self.bottom[node]], routes[self.following[node]]
+                )
+
+    def _node(self, route: Route, nodes: dict[int, int], pending: list[Route]) -> int:
+        """
+        Returns the node index of route, allocating a new node (to be filled in later) if needed.
+        """
+        node = nodes.get(id(route))
+        if node is None:
+            node = nodes[id(route)] = len(self.routes)
+            self.routes.append(route)
+            self.kinds.append(self.EMPTY)
+            self.computer_index.append(-1)
+            self.top.append(-1)
+            self.bottom.append(-1)
+            self.following.append(-1)
+            self.is_final.append(0)
+            pending.append(route)
+        return node
+
+    def _compile(self, route: Route) -> None:
+        """
+        Allocates nodes with an explicit work list, so deep routes do not recurse.
+        """
+        nodes: dict[int, int] = {}
+        pending: list[Route] = []
+        self._node(route, nodes, pending)
+        while pending:
+            current = pending.pop()
+            node = nodes[id(current)]
+            store = current.store
+            if type(store) == RouteSeries:
+                self.kinds[node] = self.SERIES
+                self.computer_index[node] = len(self.computers)
+                self.computers.append(store.computer)
+                self.is_final[node] = store.computer.name == "final"
+                self.following[node] = self._node(store.following, nodes, pending)
+            elif type(store) == RouteSplit:
+                self.kinds[node] = self.SPLIT
+                self.top[node] = self._node(store.top, nodes, pending)
+                self.bottom[node] = self._node(store.bottom, nodes, pending)
+                self.following[node] = self._node(store.following, nodes, pending)
+
+    def follow_path(self, virus_type: VirusType) -> None:
+        """
+        Follow a path and add computers according to a virus_type.
+        Produces exactly the same computers as Route.follow_path on the original route.
+
+        :complexity: O(P * select_branch) where P is the length of the path followed.
+        """
+        kinds, top, bottom, following = self.kinds, self.top, self.bottom, self.following
+        computer_index, is_final = self.computer_index, self.is_final
+        routes, computers = self.routes, self.computers
+        select_branch, add_computer = virus_type.select_branch, virus_type.add_computer
+        SERIES, SPLIT = self.SERIES, self.SPLIT
+        TOP, BOTTOM, STOP = BranchDecision.TOP, BranchDecision.BOTTOM, BranchDecision.STOP
+
+        node = 0
+        branch_history = []
+        while True:
+            kind = kinds[node]
+            if kind == SPLIT:
+                # Remember the branch we are in as will need to find its follow path later.
+                branch_history.append(node)
+                decision = select_branch(routes[top[node]], routes[bottom[node]])
+                if decision is TOP:
+                    node = top[node]
+                elif decision is BOTTOM:
+                    node = bottom[node]
+                elif decision is STOP:
+                    return
+            elif kind == SERIES:
+                add_computer(computers[computer_index[node]])
+                if is_final[node]:
+                    return
+                node = following[node]
+            elif branch_history:
+                # Empty route, exit the innermost branch.
+                node = following[branch_history.pop()]
+            else:
+                return
@@ -1,11 +1,79 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+# Fields making up Computer.sort_key, in priority order.
+ORDER_FIELDS = ("hacking_difficulty", "risk_factor", "name")
+
+
+class ComputerOrdering:
+    """
+    Rich comparisons over `sort_key`, shared by every computer representation.
+    """
+
+    __slots__ = ()
+
+    def __lt__(self, other: ComputerOrdering) -> bool:
+        if not isinstance(other, ComputerOrdering):
+            return NotImplemented
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other: ComputerOrdering) -> bool:
+        if not isinstance(other, ComputerOrdering):
+            return NotImplemented
+        return self.sort_key <= other.sort_key
+
+    def __gt__(self, other: ComputerOrdering) -> bool:
+        if not isinstance(other, ComputerOrdering):
+            return NotImplemented
+        return self.sort_key > other.sort_key
+
+    def __ge__(self, other: ComputerOrdering) -> bool:
+        if not isinstance(other, ComputerOrdering):
+            return NotImplemented
+        return self.sort_key >= other.sort_key
 
 
 @dataclass
-class Computer:
+class Computer(ComputerOrdering):
+    """
+    Computers are totally ordered by (hacking_difficulty, risk_factor, name).
+    The ordering key is built once and cached in `sort_key`. After reassigning
+    one of the fields it depends on, call refresh_sort_key before the computer
+    is sorted, searched for or added to a ComputerOrganiser again.
+    """
 
     name: str
     hacking_difficulty: int
     hacked_value: int
     risk_factor: float
+    sort_key: tuple[int, float, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.sort_key = (self.hacking_difficulty, self.risk_factor, self.name)
+
+    def refresh_sort_key(self) -> None:
+        """
+        Rebuilds sort_key from the current ORDER_FIELDS.
+        """
+        self.sort_key = (self.hacking_difficulty, self.risk_factor, self.name)
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenComputer(ComputerOrdering):
+    """
+    Immutable, hashable Computer without a per-instance __dict__.
+    `sort_key` is computed on access rather than stored, to keep instances small.
+    """
+
+    name: str
+    hacking_difficulty: int
+    hacked_value: int
+    risk_factor: float
+
+    @property
+    def sort_key(self) -> tuple[int, float, str]:
+        return (self.hacking_difficulty, self.risk_factor, self.name)
+
+    @classmethod
+    def from_computer(cls, computer: Computer) -> FrozenComputer:
+        return cls(computer.name, computer.hacking_difficulty, computer.hacked_value, computer.risk_factor)
@@ -1,41 +1,172 @@
 from __future__ import annotations
+from bisect import bisect_left, insort
+from typing import Iterable
 from computer import Computer
+from computer_query import ComputerQuery
 
 
 class ComputerManager:
+    """
+    Stores computers in buckets keyed by hacking difficulty.
+
+    - `_buckets` maps a difficulty to the list of computers with that difficulty.
+    - `_positions` maps id(computer) to the (difficulty, index) of each copy of it
+      in the buckets, so a computer can be removed by swapping it with the last
+      element of its bucket. The same object may be added more than once.
+    - `_difficulties` is the sorted list of difficulties that currently have
+      at least one computer, maintained as buckets are created and emptied.
+
+    A computer is filed under the hacking difficulty it had when it was added.
+    After reassigning the hacking_difficulty of a stored computer c, call
+    edit_computer(c, c) to move it to its new bucket; until then it is still
+    found (and removed) through its old difficulty.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
 
     def __init__(self) -> None:
-        self.computers = []
+        self._buckets: dict[int, list[Computer]] = {}
+        self._positions: dict[int, list[tuple[int, int]]] = {}
+        self._difficulties: list[int] = []
+        self._count = 0
+
+    @property
+    def computers(self) -> tuple[Computer, ...]:
+        """
+        Returns every computer in the manager, grouped by ascending difficulty.
+        This is a read-only snapshot: use add_computer and remove_computer to change the manager.
+
+        :complexity: O(N) where N is the number of computers.
+        """
+        return tuple(comp for diff in self._difficulties for comp in self._buckets[diff])
+
+    def __len__(self) -> int:
+        return self._count
 
     def add_computer(self, computer: Computer) -> None:
-        # Add a Computer object to the list.
-        self.computers.append(computer)
+        """
+        Add a Computer object to the manager.
+
+        :complexity best: O(1) when a computer with this difficulty already exists.
+        :complexity worst: O(D) when a new difficulty is added, where D is the number of distinct difficulties.
+        """
+        bucket = self._buckets.get(computer.hacking_difficulty)
+        if bucket is None:
+            bucket = self._buckets[computer.hacking_difficulty] = []
+            insort(self._difficulties, computer.hacking_difficulty)
+        self._positions.setdefault(id(computer), []).append((computer.hacking_difficulty, len(bucket)))
+        bucket.append(computer)
+        self._count += 1
+
+    def add_computers(self, computers: Iterable[Computer]) -> None:
+        """
+        Add every computer of an iterable, such as a list or a ComputerTable.
+
+        :complexity: O(M) add_computer calls, where M is the number of computers.
+        """
+        for computer in computers:
+            self.add_computer(computer)
 
     def remove_computer(self, computer: Computer) -> None:
-        # Remove a specific Computer object from the list.
-        if computer in self.computers:
-            self.computers.remove(computer)
+        """
+        Remove a specific Computer object from the manager.
+        Does nothing if the computer (or one equal to it) is not stored.
+
+        :complexity best: O(1) when this exact object was added.
+        :complexity worst: O(B + D) when an equal but different object is given,
+                           where B is the size of its difficulty bucket.
+        """
+        found = self._find(computer)
+        if found is not None:
+            self._remove_at(*found)
 
     def edit_computer(self, old: Computer, new: Computer) -> None:
-        # Replace an old Computer with a new one.
-        try:
-            index = self.computers.index(old)
-            self.computers[index] = new
-        except ValueError:
+        """
+        Replace an old Computer with a new one.
+
+        :complexity: See remove_computer and add_computer.
+        """
+        found = self._find(old)
+        if found is None:
             # Optionally, handle the case where the old computer is not found.
             print(f"Computer not found in the list: {old}")
+            return
+        diff, position = found
+        if new.hacking_difficulty == diff:
+            # Same bucket, replace in place.
+            bucket = self._buckets[diff]
+            self._forget(bucket[position], found)
+            bucket[position] = new
+            self._positions.setdefault(id(new), []).append(found)
+        else:
+            self._remove_at(diff, position)
+            self.add_computer(new)
 
     def computers_with_difficulty(self, diff: int) -> list[Computer]:
-        # Filter and return computers by specified hacking difficulty.
-        return [comp for comp in self.computers if comp.hacking_difficulty == diff]
+        """
+        Return the computers with the specified hacking difficulty.
+
+        :complexity: O(K) where K is the number of computers returned.
+        """
+        return list(self._buckets.get(diff, ()))
 
     def group_by_difficulty(self) -> list[list[Computer]]:
-        # Group and sort computers by hacking difficulty.
-        grouped = {}
-        for comp in self.computers:
-            difficulty = comp.hacking_difficulty
-            if difficulty not in grouped:
-                grouped[difficulty] = []
-            grouped[difficulty].append(comp)
-        # Convert dictionary to sorted list of lists by difficulty
-        return [grouped[key] for key in sorted(grouped)]
+        """
+        Group computers by hacking difficulty, sorted by ascending difficulty.
+
+        :complexity: O(N) where N is the number of computers.
+        """
+        return [list(self._buckets[diff]) for diff in self._difficulties]
+
+    def query(self) -> ComputerQuery:
+        """
+        Returns a vectorised ComputerQuery over a snapshot of the current computers.
+        Later changes to the manager are not reflected in the snapshot.
+
+        :complexity: O(N) where N is the number of computers.
+        :raises ImportError: when numpy is not installed.
+        """
+        return ComputerQuery(self.computers)
+
+    def _find(self, computer: Computer) -> tuple[int, int] | None:
+        """
+        Returns the (difficulty, position) of a copy of computer in the buckets, or None.
+        Falls back to an equality scan of the bucket for its difficulty when this exact object is not stored.
+        """
+        copies = self._positions.get(id(computer))
+        if copies:
+            return copies[0]
+        bucket = self._buckets.get(computer.hacking_difficulty)
+        if bucket is None:
+            return None
+        for i, comp in enumerate(bucket):
+            if comp == computer:
+                return computer.hacking_difficulty, i
+        return None
+
+    def _forget(self, computer: Computer, found: tuple[int, int]) -> None:
+        """
+        Removes the (difficulty, position) found from the copies of computer.
+        """
+        copies = self._positions[id(computer)]
+        copies.remove(found)
+        if not copies:
+            del self._positions[id(computer)]
+
+    def _remove_at(self, diff: int, position: int) -> None:
+        """
+        Remove the computer at position in the bucket for diff,
+        by moving the last computer of the bucket into its place.
+        """
+        bucket = self._buckets[diff]
+        removed = bucket[position]
+        self._forget(removed, (diff, position))
+        last = bucket.pop()
+        if position < len(bucket):
+            bucket[position] = last
+            copies = self._positions[id(last)]
+            copies[copies.index((diff, len(bucket)))] = (diff, position)
+        self._count -= 1
+        if not bucket:
+            del self._buckets[diff]
+            del self._difficulties[bisect_left(self._difficulties, diff)]
@@ -1,65 +1,153 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+from operator import attrgetter
+from typing import Iterable, Iterator
+
 from computer import Computer
-from algorithms import binary_search
+from algorithms.binary_search import binary_search
+from algorithms.mergesort import merge
+from data_structures.sorted_block_list import SortedBlockList
+
+SORT_KEY = attrgetter("sort_key")
+
+
+class SortedComputersView(Sequence):
+    """
+    Read-only, live view of the computers in a ComputerOrganiser, in sorted order.
+    Compares equal to any sequence holding the same computers in the same order.
+
+    Indexing is O(1) for the list backend and O(log N) for the blocks backend.
+    """
+
+    __slots__ = ("_organiser",)
+
+    def __init__(self, organiser: ComputerOrganiser) -> None:
+        self._organiser = organiser
+
+    def _store(self) -> list[Computer] | SortedBlockList:
+        # Looked up on every access, since the list backend replaces its list on each batch.
+        if self._organiser.backend == "list":
+            return self._organiser._sorted_list
+        return self._organiser._blocks
+
+    def __len__(self) -> int:
+        return len(self._organiser)
+
+    def __getitem__(self, index: int | slice) -> Computer | list[Computer]:
+        """
+        :raises IndexError: when the index is out of range.
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._store()[index]
+
+    def __iter__(self) -> Iterator[Computer]:
+        """
+        :complexity: O(N)
+        """
+        return iter(self._store())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"SortedComputersView({list(self)})"
+
 
 class ComputerOrganiser:
 
-    def __init__(self) -> None:
+    # Storage backends:
+    # - "list": a single sorted list, rebuilt by merging on every batch.
+    # - "blocks": a SortedBlockList, with logarithmic insert, delete and rank.
+    BACKENDS = ("list", "blocks")
+
+    def __init__(self, backend: str = "blocks") -> None:
         """
         Initializes a new ComputerOrganiser instance.
-        
-        Time Complexity: O(1), as it just initializes an empty list.
+
+        Time Complexity: O(1), as it just initializes an empty store.
+        :raises ValueError: when the backend is not one of BACKENDS.
         """
-        self.sorted_computers = []
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {backend}, expected one of {self.BACKENDS}")
+        self.backend = backend
+        self._sorted_list = []
+        self._blocks = SortedBlockList()
 
-    def add_computers(self, computers: list[Computer]) -> None:
+    @property
+    def sorted_computers(self) -> SortedComputersView:
         """
-        Adds a list of computers to the organiser in sorted order.
-        
-        Time Complexity: 
+        Returns a read-only view of all computers in sorted order, which follows later changes.
+        Use add_computers and remove_computer to change the organiser.
+
+        Time Complexity: O(1), see SortedComputersView for indexing.
+        """
+        return SortedComputersView(self)
+
+    def __len__(self) -> int:
+        if self.backend == "list":
+            return len(self._sorted_list)
+        return len(self._blocks)
+
+    def add_computers(self, computers: Iterable[Computer]) -> None:
+        """
+        Adds a list of computers (or any iterable, such as a ComputerTable)
+        to the organiser in sorted order.
+
+        Time Complexity (list backend):
         - Sorting the new computers: O(M log M), where M is the number of new computers.
         - Merging the new sorted computers with the existing sorted list: O(M + N),
           where N is the total number of computers already in the organiser.
         Overall: O(M log M + N)
+
+        Time Complexity (blocks backend): O(M (log N + L)), where L is the block size.
         """
-        # Sort the incoming computers based on the criteria: O(M log M)
-        computers.sort(key=lambda c: (c.hacking_difficulty, c.risk_factor, c.name))
+        if self.backend == "blocks":
+            for computer in computers:
+                self._blocks.add(computer.sort_key, computer)
+            return
+
+        if not isinstance(computers, list):
+            computers = list(computers)
+
+        # Sort the incoming computers by their cached sort keys: O(M log M)
+        computers.sort(key=SORT_KEY)
 
         # Merge the newly sorted computers with the already sorted list: O(M + N)
-        new_sorted_list = []
-        i = j = 0
-        while i < len(self.sorted_computers) and j < len(computers):
-            if (self.sorted_computers[i].hacking_difficulty, self.sorted_computers[i].risk_factor, self.sorted_computers[i].name) <= \
-               (computers[j].hacking_difficulty, computers[j].risk_factor, computers[j].name):
-                new_sorted_list.append(self.sorted_computers[i])
-                i += 1
-            else:
-                new_sorted_list.append(computers[j])
-                j += 1
-        # Add any remaining items from the lists
-        new_sorted_list.extend(self.sorted_computers[i:])
-        new_sorted_list.extend(computers[j:])
-        
-        self.sorted_computers = new_sorted_list
+        self._sorted_list = merge(self._sorted_list, computers, key=SORT_KEY)
+
+    def remove_computer(self, computer: Computer) -> None:
+        """
+        Removes a computer from the organiser.
+
+        Time Complexity: O(N) for the list backend, O(log N + L) for the blocks backend.
+        :raises KeyError: when the computer is not in the organiser.
+        """
+        if self.backend == "blocks":
+            self._blocks.remove(computer.sort_key, computer)
+        else:
+            del self._sorted_list[self.cur_position(computer)]
 
     def cur_position(self, computer: Computer) -> int:
         """
         Finds the current position of a computer in the sorted list.
-        
+
         Time Complexity: O(log N), where N is the total number of computers
         already in the organiser. This is because a binary search is used
         to find the position.
+        :raises KeyError: when the computer is not in the organiser.
         """
+        if self.backend == "blocks":
+            try:
+                return self._blocks.index(computer.sort_key, computer)
+            except KeyError:
+                raise KeyError("Computer not found in the organiser.")
+
         # Perform binary search within the list: O(log N)
-        left, right = 0, len(self.sorted_computers) - 1
-        while left <= right:
-            mid = (left + right) // 2
-            if self.sorted_computers[mid] == computer:
-                return mid
-            elif (self.sorted_computers[mid].hacking_difficulty, self.sorted_computers[mid].risk_factor, self.sorted_computers[mid].name) < \
-                 (computer.hacking_difficulty, computer.risk_factor, computer.name):
-                left = mid + 1
-            else:
-                right = mid - 1
-        raise KeyError("Computer not found in the organiser.")
\ No newline at end of file
+        position = binary_search(self._sorted_list, computer, key=SORT_KEY)
+        if position < len(self._sorted_list) and self._sorted_list[position] == computer:
+            return position
+        raise KeyError("Computer not found in the organiser.")
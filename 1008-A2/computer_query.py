@@ -0,0 +1,148 @@
+from __future__ import annotations
+from typing import Iterable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+from computer import Computer
+
+
+class ComputerQuery:
+    """
+    Vectorised queries over a snapshot of computers.
+
+    The fields are copied once into NumPy columns, so predicates, ordering
+    and aggregation run as array operations rather than Python loops.
+    Query methods take and return index arrays into `computers`;
+    use `select` to turn indices back into Computer objects.
+
+    Requires numpy.
+    """
+
+    COLUMNS = ("hacking_difficulty", "hacked_value", "risk_factor")
+
+    def __init__(self, computers: Iterable[Computer]) -> None:
+        """
+        :complexity: O(N) where N is the number of computers.
+        :raises ImportError: when numpy is not installed.
+        """
+        if np is None:
+            raise ImportError("ComputerQuery requires numpy")
+        self.computers = list(computers)
+        self.hacking_difficulty = np.fromiter((c.hacking_difficulty for c in self.computers), dtype=np.int64, count=len(self.computers))
+        self.hacked_value = np.fromiter((c.hacked_value for c in self.computers), dtype=np.int64, count=len(self.computers))
+        self.risk_factor = np.fromiter((c.risk_factor for c in self.computers), dtype=np.float64, count=len(self.computers))
+
+    def __len__(self) -> int:
+        return len(self.computers)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        :raises KeyError: when name is not one of COLUMNS.
+        """
+        if name not in self.COLUMNS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def filter(
+        self,
+        difficulty: tuple[int | None, int | None] | None = None,
+        value: tuple[int | None, int | None] | None = None,
+        risk: tuple[float | None, float | None] | None = None,
+        risk_below: float | None = None,
+    ) -> np.ndarray:
+        """
+        Returns the indices of computers matching every given predicate.
+
+        difficulty, value and risk are inclusive (low, high) ranges on
+        hacking_difficulty, hacked_value and risk_factor; either end may be None.
+        risk_below keeps computers with risk_factor strictly below it.
+
+        :complexity: O(N) vectorised.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for column, bounds in ((self.hacking_difficulty, difficulty), (self.hacked_value, value), (self.risk_factor, risk)):
+            if bounds is None:
+                continue
+            low, high = bounds
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        if risk_below is not None:
+            mask &= self.risk_factor < risk_below
+        return np.flatnonzero(mask)
+
+    def order_by(self, column: str, indices: np.ndarray | None = None, descending: bool = False) -> np.ndarray:
+        """
+        Returns indices (all computers by default) ordered by a column.
+        The sort is stable, so ties keep their original order.
+
+        :complexity: O(K log K) where K is the number of indices.
+        """
+        if indices is None:
+            indices = np.arange(len(self))
+        values = self.column(column)[indices]
+        order = np.argsort(-values if descending else values, kind="stable")
+        return indices[order]
+
+    def top_k(self, column: str, k: int, indices: np.ndarray | None = None, largest: bool = True) -> np.ndarray:
+        """
+        Returns the indices of the k computers with the largest (or smallest)
+        values in a column, ordered best first.
+
+        :complexity: O(K + k log k) where K is the number of indices.
+        """
+        if indices is None:
+            indices = np.arange(len(self))
+        k = min(k, len(indices))
+        if k <= 0:
+            return indices[:0]
+        values = self.column(column)[indices]
+        if largest:
+            values = -values
+        if k < len(indices):
+            part = np.argpartition(values, k - 1)[:k]
+        else:
+            part = np.arange(len(indices))
+        part = part[np.argsort(values[part], kind="stable")]
+        return indices[part]
+
+    def group_by_difficulty(self, column: str, aggregate: str = "sum", indices: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Aggregates a column per hacking_difficulty.
+
+        aggregate is one of "count", "sum", "mean", "min" or "max".
+        Returns (difficulties, results), with difficulties in ascending order.
+
+        :complexity: O(K log K) where K is the number of indices.
+        :raises ValueError: when aggregate is not supported.
+        """
+        reducers = {"sum": np.add, "min": np.minimum, "max": np.maximum}
+        if aggregate not in ("count", "mean") and aggregate not in reducers:
+            raise ValueError(f"Unknown aggregate {aggregate}")
+        if indices is None:
+            indices = np.arange(len(self))
+        keys = self.hacking_difficulty[indices]
+        values = self.column(column)[indices]
+
+        order = np.argsort(keys, kind="stable")
+        keys, values = keys[order], values[order]
+        groups, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+        if len(groups) == 0:
+            return groups, values[:0]
+        if aggregate == "count":
+            return groups, counts
+        if aggregate == "mean":
+            return groups, np.add.reduceat(values, starts) / counts
+        return groups, reducers[aggregate].reduceat(values, starts)
+
+    def select(self, indices: Iterable[int]) -> list[Computer]:
+        """
+        Returns the computers at the given indices.
+
+        :complexity: O(K) where K is the number of indices.
+        """
+        return [self.computers[i] for i in indices]
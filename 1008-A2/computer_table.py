@@ -0,0 +1,124 @@
+from __future__ import annotations
+from array import array
+from typing import Iterable, Iterator
+
+from computer import Computer, ComputerOrdering
+
+
+class ComputerRow(ComputerOrdering):
+    """
+    Lightweight view of a single row of a ComputerTable.
+
+    Behaves like a read-only Computer: it exposes the same fields and
+    `sort_key`, so managers and organisers can store it directly.
+    Two views of the same row compare equal.
+    """
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: ComputerTable, index: int) -> None:
+        self.table = table
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self.table.names[self.index]
+
+    @property
+    def hacking_difficulty(self) -> int:
+        return self.table.difficulties[self.index]
+
+    @property
+    def hacked_value(self) -> int:
+        return self.table.values[self.index]
+
+    @property
+    def risk_factor(self) -> float:
+        return self.table.risk_factors[self.index]
+
+    @property
+    def sort_key(self) -> tuple[int, float, str]:
+        i = self.index
+        return (self.table.difficulties[i], self.table.risk_factors[i], self.table.names[i])
+
+    def to_computer(self) -> Computer:
+        return Computer(self.name, self.hacking_difficulty, self.hacked_value, self.risk_factor)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ComputerRow):
+            return NotImplemented
+        return self.table is other.table and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.table), self.index))
+
+    def __repr__(self) -> str:
+        return (f"ComputerRow(name={self.name!r}, hacking_difficulty={self.hacking_difficulty!r}, "
+                f"hacked_value={self.hacked_value!r}, risk_factor={self.risk_factor!r})")
+
+
+class ComputerTable:
+    """
+    Columnar store of computers.
+
+    Names are kept in a list, while difficulties, hacked values and risk
+    factors are kept in typed arrays, so each computer costs a few machine
+    words instead of a full object. Rows are handed out as ComputerRow views.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, computers: Iterable[Computer] = ()) -> None:
+        self.names: list[str] = []
+        self.difficulties = array("q")
+        self.values = array("q")
+        self.risk_factors = array("d")
+        self.extend(computers)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> ComputerRow:
+        """
+        :raises IndexError: when the index is out of range.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return ComputerRow(self, index)
+
+    def __iter__(self) -> Iterator[ComputerRow]:
+        """
+        :complexity: O(N)
+        """
+        for i in range(len(self)):
+            yield ComputerRow(self, i)
+
+    def append(self, computer: Computer) -> ComputerRow:
+        """
+        Adds a computer as a new row, returning a view of that row.
+        """
+        self.names.append(computer.name)
+        self.difficulties.append(computer.hacking_difficulty)
+        self.values.append(computer.hacked_value)
+        self.risk_factors.append(computer.risk_factor)
+        return ComputerRow(self, len(self) - 1)
+
+    def extend(self, computers: Iterable[Computer]) -> None:
+        """
+        :complexity: O(M) where M is the number of computers added.
+        """
+        for computer in computers:
+            self.append(computer)
+
+    def to_computers(self) -> list[Computer]:
+        """
+        Materialises every row as a Computer.
+
+        :complexity: O(N)
+        """
+        return [
+            Computer(name, diff, value, risk)
+            for name, diff, value, risk in zip(self.names, self.difficulties, self.values, self.risk_factors)
+        ]
@@ -1,14 +1,21 @@
 """ Hash Table ADT
 
-Defines a Hash Table using Linear Probing for conflict resolution.
+Defines a Hash Table using open addressing for conflict resolution.
+Probing is linear by default, other strategies are in data_structures.probing.
+Deletion either re-inserts the rest of the probe cluster, or (in tombstone
+mode) marks the slot with TOMBSTONE and compacts the table once tombstones
+take up too many of the free slots.
+Tables grow through TABLE_SIZES once the load factor passes MAX_LOAD, and
+shrink back down once it drops below MIN_LOAD.
 """
 from __future__ import annotations
 __author__ = 'Jackson Goerner'
 __since__ = '07/02/2023'
 
 
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterable
 from data_structures.referential_array import ArrayR
+from data_structures.probing import ProbeStrategy, LINEAR
 
 K = TypeVar('K')
 V = TypeVar('V')
@@ -17,6 +24,18 @@ class FullError(Exception):
     pass
 
 
+class _Tombstone:
+    """
+    Marks a deleted slot: probing continues past it, but it can be reused on insert.
+    """
+
+    def __repr__(self) -> str:
+        return "TOMBSTONE"
+
+
+TOMBSTONE = _Tombstone()
+
+
 class LinearProbeTable(Generic[K, V]):
     """
     Linear Probe Table.
@@ -34,22 +53,71 @@ class LinearProbeTable(Generic[K, V]):
 
     HASH_BASE = 31
 
-    def __init__(self, sizes=None) -> None:
+    # Mask reducing the built-in hash to an unsigned 64-bit integer.
+    HASH_MASK = (1 << 64) - 1
+
+    # In tombstone mode, the table is compacted once tombstones fill this fraction of the non-live slots.
+    TOMBSTONE_RATIO = 0.5
+
+    # The table grows once more than MAX_LOAD of its slots hold items,
+    # and shrinks on delete once fewer than MIN_LOAD do (0 never shrinks).
+    # A shrink leaves the table at most MAX_LOAD / 2 full, so a shrink is never undone by the next few inserts.
+    MAX_LOAD = 0.5
+    MIN_LOAD = 0.125
+
+    def __init__(self, sizes=None, tombstones: bool = False, probing: ProbeStrategy | None = None, fast_hash: bool = False,
+                 max_load: float | None = None, min_load: float | None = None) -> None:
         """
         Initialise the Hash Table.
+
+        tombstones: delete by leaving a TOMBSTONE in the slot, rather than re-inserting the rest of the cluster.
+                    Always on for probing strategies that do not support cluster deletion.
+        probing:    the ProbeStrategy to use, linear probing by default.
+        fast_hash:  hash keys with key_hash, which does not depend on the table size and is
+                    stored next to each entry, so resizing never hashes a key again.
+                    Otherwise the polynomial `hash` is used.
+        max_load:   overrides MAX_LOAD, at most the MAX_LOAD of the probing strategy.
+        min_load:   overrides MIN_LOAD.
+
+        :raises ValueError: unless 0 <= min_load < max_load <= probing.MAX_LOAD.
         """
         if sizes is not None:
             self.TABLE_SIZES = sizes
+        if max_load is not None:
+            self.MAX_LOAD = max_load
+        if min_load is not None:
+            self.MIN_LOAD = min_load
+        if not 0 <= self.MIN_LOAD < self.MAX_LOAD <= 1:
+            raise ValueError(f"Load factors must satisfy 0 <= min_load < max_load <= 1, got {self.MIN_LOAD} and {self.MAX_LOAD}")
+        self.probing = probing if probing is not None else LINEAR
+        if self.MAX_LOAD > self.probing.MAX_LOAD:
+            raise ValueError(f"{self.probing!r} only guarantees inserts up to a load of {self.probing.MAX_LOAD}, got {self.MAX_LOAD}")
+        self.use_tombstones = tombstones or not self.probing.CLUSTER_DELETE
         self.size_index = 0
         self.array:ArrayR[tuple[K, V]] = ArrayR(self.TABLE_SIZES[self.size_index])
         self.count = 0
+        self.tombstones = 0
+        self.fast_hash = fast_hash
+        # In fast_hash mode, hashes[i] is the key_hash of the key stored in array[i].
+        self.hashes: ArrayR[int] | None = ArrayR(self.table_size) if fast_hash else None
+
+    def key_hash(self, key: K) -> int:
+        """
+        Table size independent 64-bit hash of a key, based on the built-in hash.
+        Strings cache their built-in hash, so this is O(len(key)) only the first time a key is seen.
+        Like the built-in hash, it differs between runs unless PYTHONHASHSEED is set.
+        """
+        return hash(key) & self.HASH_MASK
 
     def hash(self, key: K) -> int:
         """
         Hash a key for insert/retrieve/update into the hashtable.
+        In fast_hash mode this reduces key_hash modulo the table size.
 
         :complexity: O(len(key))
         """
+        if self.fast_hash:
+            return self.key_hash(key) % self.table_size
 
         value = 0
         a = 31415
@@ -70,30 +138,34 @@ class LinearProbeTable(Generic[K, V]):
 
     def _linear_probe(self, key: K, is_insert: bool) -> int:
         """
-        Find the correct position for this key in the hash table using linear probing.
+        Find the correct position for this key in the hash table using the probing strategy
+        (linear probing unless another was given).
         :complexity best: O(hash(key)) first position is empty
         :complexity worst: O(hash(key) + N*comp(K)) when we've searched the entire table
                         where N is the tablesize
         :raises KeyError: When the key is not in the table, but is_insert is False.
         :raises FullError: When a table is full and cannot be inserted.
         """
-        # Initial position
-        position = self.hash(key)
+        # First tombstone seen, reused when inserting a new key.
+        reusable = None
 
-        for _ in range(self.table_size):
+        for position in self.probing.sequence(self.hash(key), key, self.table_size):
             if self.array[position] is None:
                 # Empty spot. Am I upserting or retrieving?
                 if is_insert:
-                    return position
+                    return position if reusable is None else reusable
                 else:
                     raise KeyError(key)
+            elif self.array[position] is TOMBSTONE:
+                if reusable is None:
+                    reusable = position
             elif self.array[position][0] == key:
                 return position
-            else:
-                # Taken by something else. Time to linear probe.
-                position = (position + 1) % self.table_size
+            # Taken by something else. Time to probe.
 
         if is_insert:
+            if reusable is not None:
+                return reusable
             raise FullError("Table is full!")
         else:
             raise KeyError(key)
@@ -106,7 +178,7 @@ class LinearProbeTable(Generic[K, V]):
         """
         res = []
         for x in range(self.table_size):
-            if self.array[x] is not None:
+            if self.array[x] is not None and self.array[x] is not TOMBSTONE:
                 res.append(self.array[x][0])
         return res
 
@@ -118,7 +190,7 @@ class LinearProbeTable(Generic[K, V]):
         """
         res = []
         for x in range(self.table_size):
-            if self.array[x] is not None:
+            if self.array[x] is not None and self.array[x] is not TOMBSTONE:
                 res.append(self.array[x][1])
         return res
 
@@ -152,16 +224,117 @@ class LinearProbeTable(Generic[K, V]):
         :complexity: See linear probe.
         :raises FullError: when the table cannot be resized further.
         """
+        self._put(key, data)
+
+        if len(self) > self.table_size * self.MAX_LOAD:
+            self._rehash()
+        elif self.tombstones:
+            self._check_tombstones()
 
+    def _put(self, key: K, data: V) -> None:
+        """
+        Inserts or updates a (key, value) pair, without resizing the table.
+
+        :complexity: See linear probe.
+        :raises FullError: when there is no free slot for a new key.
+        """
         position = self._linear_probe(key, True)
 
-        if self.array[position] is None:
+        if self.array[position] is None or self.array[position] is TOMBSTONE:
             self.count += 1
+            if self.probing.ROBIN_HOOD:
+                self._robin_hood_insert(key, data)
+            else:
+                if self.array[position] is TOMBSTONE:
+                    self.tombstones -= 1
+                self.array[position] = (key, data)
+                if self.hashes is not None:
+                    self.hashes[position] = self.key_hash(key)
+        else:
+            self.array[position] = (key, data)
 
-        self.array[position] = (key, data)
+    def update(self, items: Iterable[tuple[K, V]]) -> None:
+        """
+        Sets every (key, value) pair in items, later pairs winning for repeated keys.
+        The table is first resized once to fit all of them, so no rehash happens part way through.
 
-        if len(self) > self.table_size / 2:
-            self._rehash()
+        :complexity: O(N + M*linear probe) where N is the table size after resizing and M is len(items).
+        :raises FullError: when the table cannot be resized far enough.
+        """
+        items = list(items)
+        size_index = self._size_index_for(len(self) + len(items))
+        if size_index > self.size_index:
+            self._resize(size_index)
+        for key, data in items:
+            self._put(key, data)
+
+        if self.tombstones:
+            self._check_tombstones()
+
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[K, V]], **kwargs) -> LinearProbeTable[K, V]:
+        """
+        Builds a table holding the (key, value) pairs in items, sized for them up front.
+        kwargs are passed on to the constructor.
+
+        :complexity: See update.
+        """
+        table = cls(**kwargs)
+        table.update(items)
+        return table
+
+    def _size_index_for(self, count: int) -> int:
+        """
+        Returns the index of the smallest size in TABLE_SIZES holding count items within MAX_LOAD,
+        or the last index if none does.
+        """
+        for size_index in range(len(self.TABLE_SIZES)):
+            if count <= self.TABLE_SIZES[size_index] * self.MAX_LOAD:
+                return size_index
+        return len(self.TABLE_SIZES) - 1
+
+    def _robin_hood_insert(self, key: K, data: V) -> None:
+        """
+        Inserts a new key, taking the slot of the first item that is closer to its home than
+        the item being placed is, then placing the displaced item further along in the same way.
+        Stops at the first empty slot or tombstone.
+
+        :complexity: O(P * hash(K)) where P is the length of the cluster walked.
+        """
+        self._robin_hood_place((key, data), self.key_hash(key) if self.hashes is not None else None)
+
+    def _robin_hood_place(self, entry: tuple[K, V], entry_hash: int | None) -> None:
+        """
+        Robin Hood placement of an entry whose key is not in the table.
+        entry_hash is its cached key_hash in fast_hash mode, None otherwise.
+        """
+        position = self.hash(entry[0]) if entry_hash is None else entry_hash % self.table_size
+        distance = 0
+        while True:
+            item = self.array[position]
+            if item is None or item is TOMBSTONE:
+                if item is TOMBSTONE:
+                    self.tombstones -= 1
+                self.array[position] = entry
+                if self.hashes is not None:
+                    self.hashes[position] = entry_hash
+                return
+            item_distance = (position - self._home_of(position)) % self.table_size
+            if item_distance < distance:
+                self.array[position], entry = entry, item
+                if self.hashes is not None:
+                    self.hashes[position], entry_hash = entry_hash, self.hashes[position]
+                distance = item_distance
+            position = (position + 1) % self.table_size
+            distance += 1
+
+    def _home_of(self, position: int) -> int:
+        """
+        Returns the home position of the item stored at position, using its cached hash if there is one.
+        """
+        if self.hashes is not None:
+            return self.hashes[position] % self.table_size
+        return self.hash(self.array[position][0])
 
     def __delitem__(self, key: K) -> None:
         """
@@ -169,21 +342,57 @@ class LinearProbeTable(Generic[K, V]):
 
         :complexity best: O(hash(key)) deleting item is not probed and in correct spot.
         :complexity worst: O(N*hash(key)+N^2*comp(K)) deleting item is midway through large chain.
+                           In tombstone mode, O(hash(key) + N*comp(K)) plus an amortised share of compaction.
+                           Either way, plus an amortised share of shrinking.
         :raises KeyError: when the key doesn't exist.
         """
         position = self._linear_probe(key, False)
+        self.count -= 1
+        if self.use_tombstones:
+            self.array[position] = TOMBSTONE
+            self.tombstones += 1
+            if not self._shrink():
+                self._check_tombstones()
+            return
         # Remove the element
         self.array[position] = None
-        self.count -= 1
         # Start moving over the cluster
         position = (position + 1) % self.table_size
         while self.array[position] is not None:
-            key2, value = self.array[position]
+            item = self.array[position]
             self.array[position] = None
-            # Reinsert.
-            newpos = self._linear_probe(key2, True)
-            self.array[newpos] = (key2, value)
+            # Reinsert, carrying the cached hash along.
+            if self.hashes is not None:
+                newpos = self._free_slot(self.hashes[position] % self.table_size, item[0])
+                self.hashes[newpos] = self.hashes[position]
+            else:
+                newpos = self._linear_probe(item[0], True)
+            self.array[newpos] = item
             position = (position + 1) % self.table_size
+        self._shrink()
+
+    def _shrink(self) -> bool:
+        """
+        Once fewer than MIN_LOAD of the slots hold items, moves the table to the smallest
+        size in TABLE_SIZES that it fills to at most MAX_LOAD / 2.
+        Returns whether the table was resized.
+
+        :complexity: O(1) if the table is not resized, otherwise see _rehash.
+        """
+        if self.count >= self.table_size * self.MIN_LOAD:
+            return False
+        for size_index in range(self.size_index):
+            if self.count <= self.TABLE_SIZES[size_index] * self.MAX_LOAD / 2:
+                self._resize(size_index)
+                return True
+        return False
+
+    def _check_tombstones(self) -> None:
+        """
+        Compacts the table if tombstones take up too many of the slots not holding a live item.
+        """
+        if self.tombstones > (self.table_size - self.count) * self.TOMBSTONE_RATIO:
+            self._resize(self.size_index)
 
     def is_empty(self) -> bool:
         return self.count == 0
@@ -196,20 +405,65 @@ class LinearProbeTable(Generic[K, V]):
         Need to resize table and reinsert all values
 
         :complexity best: O(N*hash(K)) No probing.
-        :complexity worst: O(N*hash(K) + N^2*comp(K)) Lots of probing.
-        Where N is len(self)
+        :complexity worst: O(N*hash(K) + N^2) Lots of probing.
+        Where N is len(self), and hash(K) is O(1) in fast_hash mode.
         """
-        old_array = self.array
-        self.size_index += 1
-        if self.size_index >= len(self.TABLE_SIZES):
+        if self.size_index + 1 >= len(self.TABLE_SIZES):
             # Cannot be resized further.
             return
+        self._resize(self.size_index + 1)
+
+    def _resize(self, size_index: int) -> None:
+        """
+        Reinserts all values into a new array of size TABLE_SIZES[size_index], dropping any tombstones.
+        With the current size_index this compacts the table.
+
+        :complexity: See _rehash.
+        """
+        old_array = self.array
+        old_hashes = self.hashes
+        self.size_index = size_index
         self.array = ArrayR(self.TABLE_SIZES[self.size_index])
+        if old_hashes is not None:
+            self.hashes = ArrayR(self.table_size)
         self.count = 0
-        for item in old_array:
-            if item is not None:
-                key, value = item
-                self[key] = value
+        self.tombstones = 0
+
+        # Keys are unique, so each item only needs a free slot: no key comparisons, load checks or nested resizes.
+        # In fast_hash mode the home position comes from the cached hash.
+        for i in range(len(old_array)):
+            item = old_array[i]
+            if item is None or item is TOMBSTONE:
+                continue
+            entry_hash = None if old_hashes is None else old_hashes[i]
+            if self.probing.ROBIN_HOOD:
+                self._robin_hood_place(item, entry_hash)
+            else:
+                home = self.hash(item[0]) if entry_hash is None else entry_hash % self.table_size
+                position = self._free_slot(home, item[0])
+                self.array[position] = item
+                if old_hashes is not None:
+                    self.hashes[position] = entry_hash
+            self.count += 1
+
+    def _free_slot(self, home: int, key: K) -> int:
+        """
+        Returns the first empty slot in the probe sequence for key starting at home.
+
+        :raises FullError: when there is no empty slot.
+        """
+        if self.probing.CLUSTER_DELETE:
+            # The probe sequence is the run of slots after home, so walk it without a generator.
+            size = self.table_size
+            for i in range(size):
+                position = (home + i) % size
+                if self.array[position] is None:
+                    return position
+            raise FullError("Table is full!")
+        for position in self.probing.sequence(home, key, self.table_size):
+            if self.array[position] is None:
+                return position
+        raise FullError("Table is full!")
 
     def __str__(self) -> str:
         """
@@ -219,7 +473,7 @@ class LinearProbeTable(Generic[K, V]):
         """
         result = ""
         for item in self.array:
-            if item is not None:
+            if item is not None and item is not TOMBSTONE:
                 (key, value) = item
                 result += "(" + str(key) + "," + str(value) + ")\n"
         return result
@@ -0,0 +1,99 @@
+""" Probing Strategies
+
+Defines the order in which open addressing hash tables visit slots
+when the home position of a key is taken.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Iterator
+
+
+class ProbeStrategy(ABC):
+    """
+    A probing strategy yields the positions to try for a key, starting at its home position.
+
+    Class Attributes:
+        - CLUSTER_DELETE:   True if items for a home position are always stored
+                            in the contiguous run of slots after it, so a delete
+                            can re-insert the rest of the cluster. Strategies
+                            without this property must delete with tombstones.
+        - ROBIN_HOOD:       True if inserts should displace items that are
+                            closer to their home position than the new item.
+        - MAX_LOAD:         The highest load factor at which every insert is
+                            guaranteed to find a free slot in a prime sized table.
+    """
+
+    CLUSTER_DELETE = False
+    ROBIN_HOOD = False
+    MAX_LOAD = 1.0
+
+    @abstractmethod
+    def sequence(self, home: int, key, table_size: int) -> Iterator[int]:
+        """
+        Yields at most table_size positions to probe, starting with home.
+        """
+        raise NotImplementedError()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class LinearProbing(ProbeStrategy):
+    """
+    Tries home, home + 1, home + 2, ...
+    """
+
+    CLUSTER_DELETE = True
+
+    def sequence(self, home: int, key, table_size: int) -> Iterator[int]:
+        for i in range(table_size):
+            yield (home + i) % table_size
+
+
+class QuadraticProbing(ProbeStrategy):
+    """
+    Tries home, home + 1, home + 4, home + 9, ...
+
+    For a prime table size this reaches (table_size + 1) / 2 distinct slots,
+    so inserts are only guaranteed to succeed while the table is at most half full.
+    """
+
+    MAX_LOAD = 0.5
+
+    def sequence(self, home: int, key, table_size: int) -> Iterator[int]:
+        for i in range(table_size):
+            yield (home + i * i) % table_size
+
+
+class DoubleHashing(ProbeStrategy):
+    """
+    Tries home, home + step, home + 2 * step, ...
+    where step is derived from a second, table size independent, hash of the key.
+    For a prime table size every slot is reached.
+    """
+
+    def step(self, key, table_size: int) -> int:
+        return 1 + hash(key) % (table_size - 1) if table_size > 1 else 1
+
+    def sequence(self, home: int, key, table_size: int) -> Iterator[int]:
+        step = self.step(key, table_size)
+        for i in range(table_size):
+            yield (home + i * step) % table_size
+
+
+class RobinHoodProbing(LinearProbing):
+    """
+    Linear probing where inserts take the slot of any item closer to its own home
+    than the new item is, and carry on inserting the displaced item instead.
+    This evens out probe lengths.
+    """
+
+    ROBIN_HOOD = True
+
+
+LINEAR = LinearProbing()
+QUADRATIC = QuadraticProbing()
+DOUBLE_HASHING = DoubleHashing()
+ROBIN_HOOD = RobinHoodProbing()
+STRATEGIES = (LINEAR, QUADRATIC, DOUBLE_HASHING, ROBIN_HOOD)
@@ -0,0 +1,212 @@
+""" Sorted Block List
+
+Defines an ordered container made of a list of small sorted blocks.
+Each block stores keys and items in parallel lists; a Fenwick tree over
+the block lengths gives the rank of any block in O(log B).
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Generic, Iterator, TypeVar
+
+K = TypeVar('K')
+T = TypeVar('T')
+
+
+class SortedBlockList(Generic[K, T]):
+    """
+    Sorted Block List.
+
+    Type Arguments:
+        - K:    Key Type, items are ordered by their key.
+        - T:    Item Type.
+
+    With N items and a block size of L, there are roughly N/L blocks.
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    BLOCK_SIZE = 512
+
+    def __init__(self, block_size: int | None = None) -> None:
+        if block_size is not None:
+            self.BLOCK_SIZE = block_size
+        self.key_blocks: list[list[K]] = []
+        self.item_blocks: list[list[T]] = []
+        # Largest key in each block, used to find the block for a key.
+        self.maxes: list[K] = []
+        self.tree: list[int] = [0]
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        :complexity: O(N)
+        """
+        for block in self.item_blocks:
+            yield from block
+
+    def __getitem__(self, index: int) -> T:
+        """
+        Returns the item at a particular rank.
+
+        :complexity: O(log N)
+        :raises IndexError: when the index is out of range.
+        """
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        block, offset = self._locate(index)
+        return self.item_blocks[block][offset]
+
+    def add(self, key: K, item: T) -> None:
+        """
+        Inserts item with the given key, after any items with an equal key.
+
+        :complexity: O(log N + L), amortised over block splits.
+        """
+        if not self.maxes:
+            self.key_blocks.append([key])
+            self.item_blocks.append([item])
+            self.maxes.append(key)
+            self._rebuild_tree()
+            self.count = 1
+            return
+
+        block = bisect_right(self.maxes, key)
+        if block == len(self.maxes):
+            # Larger than everything, append to the last block.
+            block -= 1
+            self.key_blocks[block].append(key)
+            self.item_blocks[block].append(item)
+            self.maxes[block] = key
+        else:
+            keys = self.key_blocks[block]
+            offset = bisect_right(keys, key)
+            keys.insert(offset, key)
+            self.item_blocks[block].insert(offset, item)
+        self.count += 1
+
+        if len(self.key_blocks[block]) > 2 * self.BLOCK_SIZE:
+            self._split(block)
+        else:
+            self._tree_update(block, 1)
+
+    def remove(self, key: K, item: T) -> None:
+        """
+        Removes item, which must have been added with the given key.
+
+        :complexity: O(log N + L + E) where E is the number of items with an equal key.
+        :raises KeyError: when the item is not in the container.
+        """
+        block, offset = self._find(key, item)
+        keys = self.key_blocks[block]
+        del keys[offset]
+        del self.item_blocks[block][offset]
+        self.count -= 1
+        if not keys:
+            del self.key_blocks[block]
+            del self.item_blocks[block]
+            del self.maxes[block]
+            self._rebuild_tree()
+        else:
+            self.maxes[block] = keys[-1]
+            self._tree_update(block, -1)
+
+    def index(self, key: K, item: T) -> int:
+        """
+        Returns the rank of item, which must have been added with the given key.
+
+        :complexity: O(log N + E) where E is the number of items with an equal key.
+        :raises KeyError: when the item is not in the container.
+        """
+        block, offset = self._find(key, item)
+        return self._prefix(block) + offset
+
+    def _find(self, key: K, item: T) -> tuple[int, int]:
+        """
+        Finds the (block, offset) of item, checking every item with an equal key.
+
+        :raises KeyError: when the item is not in the container.
+        """
+        block = bisect_left(self.maxes, key)
+        while block < len(self.maxes):
+            keys = self.key_blocks[block]
+            items = self.item_blocks[block]
+            offset = bisect_left(keys, key)
+            while offset < len(keys) and keys[offset] == key:
+                if items[offset] is item or items[offset] == item:
+                    return block, offset
+                offset += 1
+            if offset < len(keys):
+                break
+            # Equal keys may continue into the next block.
+            block += 1
+        raise KeyError(item)
+
+    def _split(self, block: int) -> None:
+        """
+        Splits an oversized block into two halves.
+
+        :complexity: O(L + N/L) as the Fenwick tree is rebuilt.
+        """
+        keys = self.key_blocks[block]
+        items = self.item_blocks[block]
+        half = len(keys) // 2
+        self.key_blocks[block:block + 1] = [keys[:half], keys[half:]]
+        self.item_blocks[block:block + 1] = [items[:half], items[half:]]
+        self.maxes[block:block + 1] = [keys[half - 1], keys[-1]]
+        self._rebuild_tree()
+
+    def _rebuild_tree(self) -> None:
+        """
+        Builds the Fenwick tree of block lengths.
+
+        :complexity: O(N/L)
+        """
+        tree = [0] + [len(block) for block in self.key_blocks]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def _tree_update(self, block: int, delta: int) -> None:
+        """
+        :complexity: O(log(N/L))
+        """
+        i = block + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, block: int) -> int:
+        """
+        Returns the number of items stored before block.
+
+        :complexity: O(log(N/L))
+        """
+        total = 0
+        i = block
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """
+        Converts a rank into a (block, offset) pair by descending the Fenwick tree.
+
+        :complexity: O(log(N/L))
+        """
+        position = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            nxt = position + step
+            if nxt < len(self.tree) and self.tree[nxt] <= index:
+                index -= self.tree[nxt]
+                position = nxt
+            step >>= 1
+        return position, index
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from typing import Generic, TypeVar, Iterator
-from data_structures.hash_table import LinearProbeTable, FullError
+from dataclasses import dataclass
+from typing import Generic, TypeVar, Iterator, Iterable
+from data_structures.hash_table import LinearProbeTable, FullError, TOMBSTONE
+from data_structures.probing import ProbeStrategy, LINEAR
 from data_structures.referential_array import ArrayR
 
 K1 = TypeVar('K1')
@@ -9,6 +11,31 @@ K2 = TypeVar('K2')
 V = TypeVar('V')
 
 
+@dataclass(frozen=True)
+class ScanCursor:
+    """
+    Where a DoubleKeyTable.scan stopped: the top-level array of its snapshot,
+    the top-level position, the position in that entry's internal table
+    and the generation of the snapshot.
+    """
+    array: ArrayR
+    top: int = 0
+    bottom: int = 0
+    generation: int = 0
+
+
+def _copy_array(array: ArrayR) -> ArrayR:
+    """
+    Returns a new ArrayR holding the same references as array.
+
+    :complexity: O(len(array))
+    """
+    copy = ArrayR(len(array))
+    for i in range(len(array)):
+        copy[i] = array[i]
+    return copy
+
+
 class DoubleKeyTable(Generic[K1, K2, V]):
     """
     Double Hash Table.
@@ -28,25 +55,67 @@ class DoubleKeyTable(Generic[K1, K2, V]):
 
     HASH_BASE = 31
 
-    def __init__(self, sizes: list | None = None, internal_sizes: list | None = None) -> None:
+    # Grow and shrink thresholds for the top-level table, see LinearProbeTable.MAX_LOAD.
+    MAX_LOAD = LinearProbeTable.MAX_LOAD
+    MIN_LOAD = LinearProbeTable.MIN_LOAD
+    # Compaction threshold for top-level tombstones, see LinearProbeTable.TOMBSTONE_RATIO.
+    TOMBSTONE_RATIO = LinearProbeTable.TOMBSTONE_RATIO
+
+    def __init__(self, sizes: list | None = None, internal_sizes: list | None = None, probing: ProbeStrategy | None = None, fast_hash: bool = False,
+                 max_load: float | None = None, min_load: float | None = None) -> None:
+        """
+        probing:   the ProbeStrategy used by the top-level table and every internal table,
+                   linear probing by default.
+        fast_hash: hash both keys with the table size independent LinearProbeTable.key_hash,
+                   which internal tables cache next to each entry.
+                   Otherwise the polynomial hash1 and hash2 are used.
+        max_load:  overrides MAX_LOAD, for the top-level table and every internal table.
+        min_load:  overrides MIN_LOAD, for the top-level table and every internal table.
+                   max_load is at most the MAX_LOAD of the probing strategy.
+
+        :raises ValueError: unless 0 <= min_load < max_load <= probing.MAX_LOAD.
+        """
         if sizes is not None:
             self.TABLE_SIZES = sizes
+        if max_load is not None:
+            self.MAX_LOAD = max_load
+        if min_load is not None:
+            self.MIN_LOAD = min_load
+        if not 0 <= self.MIN_LOAD < self.MAX_LOAD <= 1:
+            raise ValueError(f"Load factors must satisfy 0 <= min_load < max_load <= 1, got {self.MIN_LOAD} and {self.MAX_LOAD}")
 
         if internal_sizes is not None:
             self.internal_sizes = internal_sizes
         else:
             self.internal_sizes = self.TABLE_SIZES
 
+        self.probing = probing if probing is not None else LINEAR
+        if self.MAX_LOAD > self.probing.MAX_LOAD:
+            raise ValueError(f"{self.probing!r} only guarantees inserts up to a load of {self.probing.MAX_LOAD}, got {self.MAX_LOAD}")
+        self.fast_hash = fast_hash
         self.size_index = 0
         self.array: ArrayR[tuple[K1, V] | None] | None = ArrayR(self.TABLE_SIZES[self.size_index])
         self.count = 0
+        # Top-level slots holding TOMBSTONE, left by deletes when probe sequences are not contiguous.
+        self.tombstones = 0
+        # Bumped whenever a key pair is added or removed, so iterators can detect it.
+        self.version = 0
+        # Bumped by every scan snapshot. While a snapshot is live, the top-level array and internal tables
+        # from an earlier generation may be shared with it, so they are copied before being changed.
+        self.generation = 0
+        self._array_generation = 0
+        # Generations of the snapshots not yet exhausted or closed.
+        self._snapshots: set[int] = set()
 
     def hash1(self, key: K1) -> int:
         """
         Hash the 1st key for insert/retrieve/update into the hashtable.
+        In fast_hash mode this reduces the built-in hash modulo the table size.
 
         :complexity: O(len(key))
         """
+        if self.fast_hash:
+            return (hash(key) & LinearProbeTable.HASH_MASK) % self.table_size
 
         value = 0
         a = 31417
@@ -58,9 +127,12 @@ class DoubleKeyTable(Generic[K1, K2, V]):
     def hash2(self, key: K2, sub_table: LinearProbeTable[K2, V]) -> int:
         """
         Hash the 2nd key for insert/retrieve/update into the hashtable.
+        In fast_hash mode this is the sub-table's own (cached) key_hash, modulo its size.
 
         :complexity: O(len(key))
         """
+        if self.fast_hash:
+            return sub_table.key_hash(key) % sub_table.table_size
 
         value = 0
         a = 31417
@@ -71,34 +143,59 @@ class DoubleKeyTable(Generic[K1, K2, V]):
 
     def _linear_probe(self, key1: K1, key2: K2 | None, is_insert: bool) -> tuple[int, int] | int:
         """
-        Find the correct position for this key in the hash table using linear probing.
+        Find the correct position for this key in the hash table using the probing strategy
+        (linear probing unless another was given).
+        With key2 = None, returns just the top-level index of key1
+        (or, when inserting, the empty slot key1 would take).
         :raises KeyError: When the key pair is not in the table, but is_insert is False.
         :raises FullError: When a table is full and cannot be inserted.
         """
         # Calculate the top level index.
         top_level_index = self.hash1(key1)
+        # First tombstone seen, reused when inserting a new key1.
+        reusable = None
+
+        # Probe the table's top-level.
+        for top_level_index in self.probing.sequence(top_level_index, key1, self.table_size):
+            if self.array[top_level_index] is None:
+                if is_insert and reusable is not None:
+                    top_level_index = reusable
+                break
+            elif self.array[top_level_index] is TOMBSTONE:
+                if reusable is None:
+                    reusable = top_level_index
+            elif self.array[top_level_index][0] == key1:
+                break
+        else:
+            if is_insert and reusable is not None:
+                top_level_index = reusable
+            elif is_insert:
+                raise FullError("Table is full!")
+            else:
+                raise KeyError(f"Key pair ({key1}, {key2}) not found")
+        free = self.array[top_level_index] is None or self.array[top_level_index] is TOMBSTONE
 
         # If key2 is None, then return the top-level index.
         if key2 is None:
-            if not is_insert and (self.array[top_level_index] is None or self.array[top_level_index][0] != key1):
+            if not is_insert and free:
                 raise KeyError(f"Top-level key {key1} not found")
             return top_level_index
 
-        # Linear probe on the table's top-level.
-        while self.array[top_level_index] is not None and self.array[top_level_index][0] != key1:
-            top_level_index = (top_level_index + 1) % len(self.array)  # Wrap around if necessary
-
-        if self.array[top_level_index] is None:
+        if free:
             if is_insert:
                 # Create a new sub-table if necessary.
-                self.array[top_level_index] = (key1, LinearProbeTable[K2, V](self.internal_sizes))
+                entry = (key1, self._new_sub_table())
+                if self.probing.ROBIN_HOOD:
+                    top_level_index = self._robin_hood_insert(entry)
+                else:
+                    if self.array[top_level_index] is TOMBSTONE:
+                        self.tombstones -= 1
+                    self.array[top_level_index] = entry
             else:
                 raise KeyError(f"Key pair ({key1}, {key2}) not found")
         
         # Get the sub-table.
         sub_table = self.array[top_level_index][1]
-        # Override the sub table's hash function to follow the hash2 algorithm.
-        sub_table.hash = lambda k, tab= sub_table:self.hash2(k,tab)
 
         """
         while sub_table.array[bottom_level_index] is not None and sub_table.array[bottom_level_index][1] != key2:
@@ -118,10 +215,78 @@ class DoubleKeyTable(Generic[K1, K2, V]):
             # The internal table must be rehashed using its own rehash method.
             sub_table._rehash()
             # Probe again to find a position for key2 in the sub-table.
-            sub_table._linear_probe(key2, is_insert)
+            bottom_level_index = sub_table._linear_probe(key2, is_insert)
 
         return top_level_index, bottom_level_index
         
+    def _sub_table(self, key1: K1) -> LinearProbeTable[K2, V]:
+        """
+        Returns the internal table for key1, found by hashing and probing the top-level table.
+
+        :complexity: See linear probe.
+        :raises KeyError: when key1 is not in the table.
+        """
+        return self.array[self._linear_probe(key1, None, False)][1]
+
+    def _new_sub_table(self) -> LinearProbeTable[K2, V]:
+        """
+        Creates an internal table, with the settings of this table.
+        Its hash function is overridden once, here, to follow the hash2 algorithm.
+        It stays bound through the internal table's own rehashes, which use it for the new table size.
+        In fast_hash mode the internal table already hashes with its cached key_hash.
+        """
+        sub_table = LinearProbeTable[K2, V](self.internal_sizes, probing=self.probing, fast_hash=self.fast_hash,
+                                            max_load=self.MAX_LOAD, min_load=self.MIN_LOAD)
+        if not self.fast_hash:
+            sub_table.hash = lambda k, tab=sub_table: self.hash2(k, tab)
+        sub_table.generation = self.generation
+        return sub_table
+
+    def _copy_sub_table(self, sub_table: LinearProbeTable[K2, V]) -> LinearProbeTable[K2, V]:
+        """
+        Returns a copy of an internal table, in the current generation.
+
+        :complexity: O(N) where N is the internal table's size.
+        """
+        copy = self._new_sub_table()
+        copy.size_index = sub_table.size_index
+        copy.array = _copy_array(sub_table.array)
+        if sub_table.hashes is not None:
+            copy.hashes = _copy_array(sub_table.hashes)
+        copy.count = sub_table.count
+        copy.tombstones = sub_table.tombstones
+        return copy
+
+    def _prepare_write(self, key1: K1) -> None:
+        """
+        Called before changing the pairs for key1. If a scan snapshot may share the top-level array
+        or key1's internal table, they are copied first, so the snapshot never changes.
+
+        :complexity: O(1) if no snapshot is live. Otherwise a top-level probe, plus
+                     O(N) for the first change to the top-level table after a snapshot and
+                     O(M) for the first change to each internal table after a snapshot,
+                     where N and M are their sizes.
+        """
+        if not self._snapshots:
+            return
+        if self._array_generation != self.generation:
+            self.array = _copy_array(self.array)
+            self._array_generation = self.generation
+        try:
+            position1 = self._linear_probe(key1, None, False)
+        except KeyError:
+            return
+        entry = self.array[position1]
+        if entry[1].generation != self.generation:
+            self.array[position1] = (entry[0], self._copy_sub_table(entry[1]))
+
+    def _check_version(self, version: int) -> None:
+        """
+        :raises RuntimeError: if key pairs were added or removed since the table was at version.
+        """
+        if self.version != version:
+            raise RuntimeError("DoubleKeyTable changed during iteration")
+
     #passed 
     def iter_keys(self, key: K1 | None = None) -> Iterator[K1 | K2]:
         """
@@ -133,26 +298,20 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         # should return an iterator that yields the keys one by one rather than searching the entire table at the start.
         # You should NOT get all the keys at the start and just iterate through those. 
         #That won't be very efficient. Your iterator should only get the next item when it's needed.
+        # Adding or removing pairs after the first key is requested makes the iterator raise RuntimeError.
+        version = self.version
         if key is None:
             # Iterate over the top-level hash table and yield each non-None key
             for entry in self.array:
-                if entry is not None:
+                if entry is not None and entry is not TOMBSTONE:
                     yield entry[0]
-                break
+                    self._check_version(version)
         else:
-            # Iterate to find the specific top-level key and then iterate over its sub-table
-            found = False
-            for entry in self.array:
-                if entry is not None and entry[0] == key:
-                    # Once the correct sub-table is found, yield each key from this sub-table
-                    found = True
-                    for sub_entry in entry[1].array:
-                        if sub_entry is not None:
-                            yield sub_entry[0]
-                        break
-            if not found:
-                # If the loop completes without finding the key, raise KeyError
-                raise KeyError(f"Top-level key {key} not found in the hash table.")
+            # Find the specific top-level key by hashing it, then iterate over its sub-table
+            for sub_entry in self._sub_table(key).array:
+                if sub_entry is not None and sub_entry is not TOMBSTONE:
+                    yield sub_entry[0]
+                    self._check_version(version)
 
     #passed 
     def iter_values(self, key: K1 | None = None) -> Iterator[V]:
@@ -165,29 +324,71 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         # should return an iterator that yields the values one by one rather than searching the entire table at the start.
         # You should NOT get all the values at the start and just iterate through those. 
         #That won't be very efficient. Your iterator should only get the next item when it's needed.
+        # Adding or removing pairs after the first value is requested makes the iterator raise RuntimeError.
+        version = self.version
         if key is None:
             # Iterate over the entire hash table to yield all values from all sub-tables
             for entry in self.array:
-                if entry is not None:
+                if entry is not None and entry is not TOMBSTONE:
                     sub_table = entry[1]
                     for sub_entry in sub_table.array:
-                        if sub_entry is not None:
+                        if sub_entry is not None and sub_entry is not TOMBSTONE:
                             yield sub_entry[1]
+                            self._check_version(version)
                         
         else:
-            # Iterate to find the specific top-level key and then yield values from its sub-table
-            found = False
-            for entry in self.array:
-                if entry is not None and entry[0] == key:
-                    found = True
-                    sub_table = entry[1]
-                    for sub_entry in sub_table.array:
-                        if sub_entry is not None:
-                            yield sub_entry[1]
-                    break
-            if not found:
-                # If the loop completes without finding the key, raise KeyError
-                raise KeyError(f"Top-level key {key} not found in the hash table.")
+            # Find the specific top-level key by hashing it, then yield values from its sub-table
+            for sub_entry in self._sub_table(key).array:
+                if sub_entry is not None and sub_entry is not TOMBSTONE:
+                    yield sub_entry[1]
+                    self._check_version(version)
+
+    def scan(self, cursor: ScanCursor | None = None, count: int = 100) -> tuple[list[tuple[tuple[K1, K2], V]], ScanCursor | None]:
+        """
+        Pages through the ((key1, key2), value) pairs of a snapshot of the table, count pairs at a time.
+        cursor = None: takes the snapshot and returns its first page.
+        cursor = c: resumes from a cursor returned by an earlier call. Cursors can be resumed more than once.
+        Returns the page and the cursor for the next one, or None once the snapshot is exhausted.
+
+        Taking a snapshot is O(1): afterwards the table copies its top-level array and each internal table
+        the first time it changes them, so later changes to the table are never seen by the scan.
+        The snapshot is live until the scan is exhausted or close_scan is called, after which the table
+        stops copying for it, and resuming one of its cursors may see later changes.
+        A scan that is abandoned part way should be closed.
+
+        :complexity: O(count + S) where S is the number of empty slots skipped.
+        :raises ValueError: if count is not positive.
+        """
+        if count <= 0:
+            raise ValueError(f"count must be positive, got {count}")
+        if cursor is None:
+            self.generation += 1
+            self._snapshots.add(self.generation)
+            cursor = ScanCursor(self.array, generation=self.generation)
+
+        page = []
+        array, top, bottom, generation = cursor.array, cursor.top, cursor.bottom, cursor.generation
+        while top < len(array):
+            if array[top] is not None and array[top] is not TOMBSTONE:
+                key1, sub_table = array[top]
+                while bottom < len(sub_table.array):
+                    sub_entry = sub_table.array[bottom]
+                    if sub_entry is not None and sub_entry is not TOMBSTONE:
+                        if len(page) == count:
+                            return page, ScanCursor(array, top, bottom, generation)
+                        page.append(((key1, sub_entry[0]), sub_entry[1]))
+                    bottom += 1
+            top += 1
+            bottom = 0
+        self._snapshots.discard(generation)
+        return page, None
+
+    def close_scan(self, cursor: ScanCursor) -> None:
+        """
+        Ends the scan that cursor belongs to, releasing its snapshot (see scan).
+        Closing a scan again, or one that is exhausted, does nothing.
+        """
+        self._snapshots.discard(cursor.generation)
 
 
     def keys(self, key: K1 | None = None) -> list[K1 | K2]:
@@ -199,23 +400,12 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         top_level_keys = []
         if key == None:
             for x in range(self.table_size):
-                if self.array[x] is not None:
+                if self.array[x] is not None and self.array[x] is not TOMBSTONE:
                     top_level_keys.append(self.array[x][0])
             return top_level_keys
         #If key != None ==>return all low-level keys in the sub-table of top-level key.
             #In the case that the key isn't found, raise KeyError.
-        elif key != None:
-            for x in range(self.table_size):
-                if self.array[x] is not None and self.array[x][0] == key:
-                    sub_table = self.array[x][1]
-                    # Collect all second-level keys from the sub-table
-                    bottom_level_keys = [sub_entry[0] for sub_entry in sub_table.array if sub_entry is not None]
-                    return bottom_level_keys
-            # If the loop completes without finding the key, it wasn't present
-            raise KeyError(f"Key {key} not found in the top-level table.")
-            
-
-
+        return self._sub_table(key).keys()
 
     def values(self, key: K1 | None = None) -> list[V]:
         """
@@ -226,29 +416,16 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         # If key is None, return all values in all entries in the entire double key hash table (including both the top level and bottom levels)
         if key is None:
             for entry in self.array:
-                if entry is not None and entry[1] is not None:  # Check if entry and sub-table are not None
+                if entry is not None and entry is not TOMBSTONE:  # Check if entry holds a sub-table
                     for sub_entry in entry[1].array:  # entry[1] should be a sub-table
-                        if sub_entry is not None:
+                        if sub_entry is not None and sub_entry is not TOMBSTONE:
                             all_values.append(sub_entry[1])  # sub_entry[1] should be the value of the bottom-level key
             return all_values
 
         # If key is not None, restrict to all values in the sub-table of top-level key.
         # In the case that the key isn't found, raise KeyError.
         else:
-            found = False
-            for entry in self.array:
-                if entry is not None and entry[0] == key:  # Check if top-level key matches
-                    if entry[1] is not None:  # Ensure the sub-table exists
-                        found = True
-                        for sub_entry in entry[1].array:
-                            if sub_entry is not None:
-                                all_values.append(sub_entry[1])
-                        break  # Stop searching after finding and processing the correct sub-table
-
-            if not found:  # If no top-level entry matched the provided key
-                raise KeyError(f"Top-level key {key} not found in the hash table.")
-
-            return all_values
+            return self._sub_table(key).values()
 
 
 
@@ -280,17 +457,73 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         Set an (key, value) pair in our hash table.
         """
         key1, key2 = key
+        self._prepare_write(key1)
         position1, position2 = self._linear_probe(key1, key2, True)
         sub_table = self.array[position1][1]
 
         if sub_table.is_empty():
             self.count += 1
 
+        pairs = len(sub_table)
         sub_table[key2] = data
+        if len(sub_table) != pairs:
+            self.version += 1
 
         # resize if necessary
-        if len(self) > self.table_size / 2:
+        if len(self) > self.table_size * self.MAX_LOAD:
             self._rehash()
+        elif self.tombstones:
+            self._check_tombstones()
+
+    def update(self, items: Iterable[tuple[tuple[K1, K2], V]]) -> None:
+        """
+        Sets every ((key1, key2), value) pair in items, later pairs winning for repeated key pairs.
+        Pairs are grouped by key1, the top-level table is resized once to fit every new key1,
+        and each internal table is then filled with a single LinearProbeTable.update.
+
+        :complexity: O(N + M*linear probe) where N is the top-level table size after resizing and M is len(items).
+        :raises FullError: when a table cannot be resized far enough.
+        """
+        groups: dict[K1, list[tuple[K2, V]]] = {}
+        for (key1, key2), data in items:
+            groups.setdefault(key1, []).append((key2, data))
+
+        size_index = self._size_index_for(len(self) + len(groups))
+        if size_index > self.size_index:
+            self._resize(size_index)
+
+        if groups:
+            self.version += 1
+        for key1, pairs in groups.items():
+            self._prepare_write(key1)
+            # Finds or creates the internal table for key1.
+            position1, _ = self._linear_probe(key1, pairs[0][0], True)
+            sub_table = self.array[position1][1]
+            if sub_table.is_empty():
+                self.count += 1
+            sub_table.update(pairs)
+
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[tuple[K1, K2], V]], **kwargs) -> DoubleKeyTable[K1, K2, V]:
+        """
+        Builds a table holding the ((key1, key2), value) pairs in items, sized for them up front.
+        kwargs are passed on to the constructor.
+
+        :complexity: See update.
+        """
+        table = cls(**kwargs)
+        table.update(items)
+        return table
+
+    def _size_index_for(self, count: int) -> int:
+        """
+        Returns the index of the smallest size in TABLE_SIZES holding count top-level keys within MAX_LOAD,
+        or the last index if none does.
+        """
+        for size_index in range(len(self.TABLE_SIZES)):
+            if count <= self.TABLE_SIZES[size_index] * self.MAX_LOAD:
+                return size_index
+        return len(self.TABLE_SIZES) - 1
     #passed 
     def __delitem__(self, key: tuple[K1, K2]) -> None:
         """
@@ -301,25 +534,73 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         #if the key1,key2 pair was the only key1 element in the table ==> you should clear out the entirety of that internal table 
             #so that a new key1 with the same hash can be inserted in that position. 
         key1, key2 = key
+        self._prepare_write(key1)
         # Find the top-level key
-        for i in range(len(self.array)):
-            if self.array[i] is not None and self.array[i][0] == key1:
-                sub_table = self.array[i][1]
-                # Attempt to delete key2 from the sub-table
-                try:
-                    del sub_table[key2]  # Assuming sub_table supports del operation directly
-                    # Check if the sub-table is now empty
-                    if len(sub_table) == 0:
-                        # Clear the entry if the sub-table is empty
-                        self.array[i] = None
-                    return
-                except KeyError:
-                    # If the sub-table does not contain key2, raise KeyError
-                    raise KeyError(f"Key pair ({key1}, {key2}) not found in the hash table.")
-
-        # If the loop completes without deleting, key1 was not found
-        raise KeyError(f"Top-level key {key1} not found in the hash table.")
-                
+        position1 = self._linear_probe(key1, None, False)
+        sub_table = self.array[position1][1]
+        # Attempt to delete key2 from the sub-table
+        try:
+            del sub_table[key2]
+        except KeyError:
+            # If the sub-table does not contain key2, raise KeyError
+            raise KeyError(f"Key pair ({key1}, {key2}) not found in the hash table.")
+        self.version += 1
+        # Clear the entry if the sub-table is now empty
+        if len(sub_table) == 0:
+            self._delete_top_level(position1)
+
+    def _delete_top_level(self, position: int) -> None:
+        """
+        Removes the top-level entry at position, keeping every other key1 reachable by probing.
+        With linear probing the rest of the cluster is re-inserted (as in LinearProbeTable.__delitem__).
+        Other probe sequences are not contiguous, so the slot is marked with TOMBSTONE instead,
+        and the table is compacted once there are too many (as in LinearProbeTable's tombstone mode).
+
+        :complexity: O(P*hash(K)) where P is the length of the rest of the cluster,
+                     O(1) plus an amortised share of compaction with tombstones.
+        """
+        self.count -= 1
+        if not self.probing.CLUSTER_DELETE:
+            self.array[position] = TOMBSTONE
+            self.tombstones += 1
+            if not self._shrink():
+                self._check_tombstones()
+            return
+        self.array[position] = None
+        if self._shrink():
+            return
+        # Start moving over the cluster
+        position = (position + 1) % self.table_size
+        while self.array[position] is not None:
+            item = self.array[position]
+            self.array[position] = None
+            # Reinsert.
+            self._place_top_level(item)
+            position = (position + 1) % self.table_size
+
+    def _shrink(self) -> bool:
+        """
+        Once fewer than MIN_LOAD of the top-level slots hold keys, moves the top-level table
+        to the smallest size in TABLE_SIZES that it fills to at most MAX_LOAD / 2
+        (see LinearProbeTable._shrink).
+        Returns whether the table was resized.
+        """
+        if self.count >= self.table_size * self.MIN_LOAD:
+            return False
+        for size_index in range(self.size_index):
+            if self.count <= self.TABLE_SIZES[size_index] * self.MAX_LOAD / 2:
+                self._resize(size_index)
+                return True
+        return False
+
+    def _check_tombstones(self) -> None:
+        """
+        Compacts the top-level table if tombstones take up too many of the slots not holding a key1
+        (see LinearProbeTable._check_tombstones).
+        """
+        if self.tombstones > (self.table_size - self.count) * self.TOMBSTONE_RATIO:
+            self._resize(self.size_index)
+
     def _rehash(self) -> None:
         """
         Need to resize the top-level table and potentially reinsert all values if their positions change. 
@@ -328,40 +609,84 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         :complexity best: O(N*hash(K)) where N is the number of entries and K is the key complexity during hashing.
         :complexity worst: O(N*hash(K) + N^2*comp(K)) where comp(K) represents complexity due to probing in a crowded table.
         """
-        old_array = self.array  # Store the current array to reinsert its elements into a new, larger array.
-        self.size_index += 1  # Increment the index to use the next size for the hash table from the predefined sizes list.
-
         # Check if we've reached the maximum allowed size index.
-        if self.size_index >= len(self.TABLE_SIZES):
-            self.size_index -= 1  # If so, revert the increment to stay within bounds and exit the method.
+        if self.size_index + 1 >= len(self.TABLE_SIZES):
             return
+        self._resize(self.size_index + 1)
 
-        # Allocate a new array with the next size to accommodate more entries or reduce load.
-        new_array = ArrayR(self.TABLE_SIZES[self.size_index])
+    def _resize(self, size_index: int) -> None:
+        """
+        Reinserts all top-level entries into a new array of size TABLE_SIZES[size_index], dropping any tombstones.
+
+        :complexity: See _rehash.
+        """
+        old_array = self.array  # Store the current array to reinsert its elements into the new array.
+        self.size_index = size_index
+
+        # Allocate a new array with the new size to accommodate more entries or reduce load.
+        # It replaces the old array first, so hash1 uses the new table size.
+        self.array = ArrayR(self.TABLE_SIZES[self.size_index])
+        self._array_generation = self.generation
+        self.tombstones = 0
         new_count = 0  # This will count the number of actual used entries in the new array.
 
         # Iterate through each item in the old array.
         for item in old_array:
-            if item is not None:  # Check if the current slot is not empty.
+            if item is not None and item is not TOMBSTONE:  # Check if the current slot holds an entry.
                 key1, sub_table = item  # Unpack the tuple containing the key and its corresponding sub-table.
 
-                # Check if the load factor of the sub-table exceeds 0.5 and needs rehashing.
-                if len(sub_table) > len(sub_table.array) / 2:
+                # Check if the load factor of the sub-table exceeds its MAX_LOAD and needs rehashing.
+                if len(sub_table) > len(sub_table.array) * sub_table.MAX_LOAD:
+                    # A sub-table shared with a scan snapshot is copied rather than changed.
+                    if self._snapshots and sub_table.generation != self.generation:
+                        sub_table = self._copy_sub_table(sub_table)
+                        item = (key1, sub_table)
                     sub_table._rehash()  # Trigger rehash of the sub-table.
 
-                # Compute a new hash index for key1 in the resized top-level table.
-                new_index = self.hash1(key1)
-                # Resolve collisions using linear probing.
-                while new_array[new_index] is not None:
-                    new_index = (new_index + 1) % len(new_array)  # Ensure wrapping at the boundary of the array.
-
-                # Place the item at its new position in the resized array.
-                new_array[new_index] = (key1, sub_table)
+                self._place_top_level(item)
                 new_count += 1  # Increment the count of used slots.
 
-        # Replace the old array with the newly sized array and update the count of items.
-        self.array = new_array
+        # Update the count of items.
         self.count = new_count
+
+    def _place_top_level(self, item: tuple[K1, LinearProbeTable[K2, V]]) -> None:
+        """
+        Places a top-level entry whose key1 is not in the table in the first free slot of its probe sequence.
+        """
+        if self.probing.ROBIN_HOOD:
+            self._robin_hood_insert(item)
+            return
+        key1 = item[0]
+        # Resolve collisions with the probing strategy, starting at the hash index for key1.
+        for new_index in self.probing.sequence(self.hash1(key1), key1, self.table_size):
+            if self.array[new_index] is None:
+                break
+        else:
+            raise FullError("Table is full!")
+        self.array[new_index] = item
+
+    def _robin_hood_insert(self, entry: tuple[K1, LinearProbeTable[K2, V]]) -> int:
+        """
+        Inserts a new top-level entry with Robin Hood displacement (see LinearProbeTable._robin_hood_insert).
+        Returns the position the new entry ended up in.
+        """
+        position = self.hash1(entry[0])
+        distance = 0
+        placed = None
+        while True:
+            item = self.array[position]
+            if item is None:
+                self.array[position] = entry
+                return position if placed is None else placed
+            item_distance = (position - self.hash1(item[0])) % self.table_size
+            if item_distance < distance:
+                self.array[position], entry = entry, item
+                distance = item_distance
+                if placed is None:
+                    placed = position
+            position = (position + 1) % self.table_size
+            distance += 1
+
     @property
     def table_size(self) -> int:
         """
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from typing import Generic, TypeVar, Iterator
+from data_structures.hash_table import LinearProbeTable, TOMBSTONE
+from data_structures.probing import ProbeStrategy
+
+K1 = TypeVar('K1')
+K2 = TypeVar('K2')
+V = TypeVar('V')
+
+
+class FlatDoubleKeyTable(Generic[K1, K2, V]):
+    """
+    Double Key Table storing every (key1, key2) pair in one open addressing table.
+
+    Has the same interface as DoubleKeyTable, but a point lookup is a single hash and probe
+    of the composite key, rather than one in the top-level table and one in an internal table.
+    A secondary index maps each key1 to a plain list of its key2s, so keys(key1) and values(key1)
+    do not scan the whole table. Each pair stores (value, position of key2 in that list),
+    so a key2 is removed from the list by moving the last one into its place.
+
+    Keys must work with the built-in hash, which the tables use through fast_hash.
+
+    Type Arguments:
+        - K1:   1st Key Type.
+        - K2:   2nd Key Type.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, sizes: list | None = None, probing: ProbeStrategy | None = None,
+                 max_load: float | None = None, min_load: float | None = None) -> None:
+        """
+        sizes, probing, max_load and min_load are passed on to both LinearProbeTables used.
+        """
+        self.sizes = sizes
+        self.probing = probing
+        self.max_load = max_load
+        self.min_load = min_load
+        self.pairs: LinearProbeTable[tuple[K1, K2], tuple[V, int]] = self._new_table()
+        self.index: LinearProbeTable[K1, list[K2]] = self._new_table()
+        # Bumped whenever a key pair is added or removed, so iterators can detect it.
+        self.version = 0
+
+    def _new_table(self) -> LinearProbeTable:
+        return LinearProbeTable(self.sizes, probing=self.probing, fast_hash=True,
+                                max_load=self.max_load, min_load=self.min_load)
+
+    def _check_version(self, version: int) -> None:
+        """
+        :raises RuntimeError: if key pairs were added or removed since the table was at version.
+        """
+        if self.version != version:
+            raise RuntimeError("FlatDoubleKeyTable changed during iteration")
+
+    def __getitem__(self, key: tuple[K1, K2]) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: See LinearProbeTable.__getitem__.
+        :raises KeyError: when the key doesn't exist.
+        """
+        return self.pairs[key][0]
+
+    def __contains__(self, key: tuple[K1, K2]) -> bool:
+        return key in self.pairs
+
+    def __setitem__(self, key: tuple[K1, K2], data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+
+        :complexity: See LinearProbeTable.__setitem__, twice, and once more for a new pair.
+        """
+        try:
+            position = self.pairs[key][1]
+        except KeyError:
+            pass
+        else:
+            self.pairs[key] = (data, position)
+            return
+        self.version += 1
+        key1, key2 = key
+        try:
+            key2s = self.index[key1]
+        except KeyError:
+            key2s = []
+            self.index[key1] = key2s
+        self.pairs[key] = (data, len(key2s))
+        key2s.append(key2)
+
+    def __delitem__(self, key: tuple[K1, K2]) -> None:
+        """
+        Deletes a (key, value) pair in our hash table.
+
+        :complexity: See LinearProbeTable.__delitem__, plus up to four more probes.
+        :raises KeyError: when the key doesn't exist.
+        """
+        try:
+            position = self.pairs[key][1]
+        except KeyError:
+            raise KeyError(f"Key pair ({key[0]}, {key[1]}) not found in the hash table.")
+        del self.pairs[key]
+        self.version += 1
+        key1 = key[0]
+        key2s = self.index[key1]
+        last = key2s.pop()
+        if position < len(key2s):
+            # Move the last key2 into the freed position.
+            key2s[position] = last
+            self.pairs[key1, last] = (self.pairs[key1, last][0], position)
+        elif not key2s:
+            del self.index[key1]
+
+    def _key2s(self, key1: K1) -> list[K2]:
+        """
+        :raises KeyError: when key1 is not in the table.
+        """
+        try:
+            return self.index[key1]
+        except KeyError:
+            raise KeyError(f"Top-level key {key1} not found in the hash table.")
+
+    def iter_keys(self, key: K1 | None = None) -> Iterator[K1 | K2]:
+        """
+        key = None:
+            Returns an iterator of all top-level keys in hash table
+        key = k:
+            Returns an iterator of all bottom-level keys for k.
+
+        Adding or removing pairs after the first key is requested makes the iterator raise RuntimeError.
+        """
+        version = self.version
+        if key is None:
+            for entry in self.index.array:
+                if entry is not None and entry is not TOMBSTONE:
+                    yield entry[0]
+                    self._check_version(version)
+        else:
+            for key2 in self._key2s(key):
+                yield key2
+                self._check_version(version)
+
+    def iter_values(self, key: K1 | None = None) -> Iterator[V]:
+        """
+        key = None:
+            Returns an iterator of all values in hash table
+        key = k:
+            Returns an iterator of all values for top-level key k.
+
+        Adding or removing pairs after the first value is requested makes the iterator raise RuntimeError.
+        """
+        version = self.version
+        if key is None:
+            for entry in self.pairs.array:
+                if entry is not None and entry is not TOMBSTONE:
+                    yield entry[1][0]
+                    self._check_version(version)
+        else:
+            for key2 in self._key2s(key):
+                yield self.pairs[key, key2][0]
+                self._check_version(version)
+
+    def keys(self, key: K1 | None = None) -> list[K1 | K2]:
+        """
+        key = None: returns all top-level keys in the table.
+        key = x: returns all bottom-level keys for top-level key x.
+
+        :raises KeyError: when x is not in the table.
+        """
+        if key is None:
+            return self.index.keys()
+        return list(self._key2s(key))
+
+    def values(self, key: K1 | None = None) -> list[V]:
+        """
+        key = None: returns all values in the table.
+        key = x: returns all values for top-level key x.
+
+        :raises KeyError: when x is not in the table.
+        """
+        if key is None:
+            return [entry[0] for entry in self.pairs.values()]
+        return [self.pairs[key, key2][0] for key2 in self._key2s(key)]
+
+    def __len__(self) -> int:
+        """
+        Returns the number of top-level keys, as DoubleKeyTable does.
+        """
+        return len(self.index)
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Generic, TypeVar
+from heapq import merge
+from typing import Generic, TypeVar, Iterator
 
 from data_structures.referential_array import ArrayR
 
@@ -21,17 +22,81 @@ class InfiniteHashTable(Generic[K, V]):
 
     TABLE_SIZE = 27
 
-    def __init__(self, level: int = 0,parent: "InfiniteHashTable" = None) -> None:
-        self.array: ArrayR[tuple[K, V] | None] = ArrayR(self.TABLE_SIZE)
+    def __init__(self, level: int = 0,parent: "InfiniteHashTable" = None, parent_index: int | None = None,
+                 compressed: bool = False, sparse: bool = False) -> None:
+        """
+        compressed: path compression (radix mode). A sub-table is created at the first level where the
+                    keys it separates hash differently, rather than one level down, so chains of
+                    tables with a single occupied slot are never built.
+                    Locations are still the slots visited, there are just fewer of them.
+        sparse:     each table only stores its occupied slots, in slot order, in an array as long as
+                    the number of them (None when there are none), instead of one of TABLE_SIZE.
+                    Slot i is at the number of occupied slots before it, counted in the occupied bitmap.
+                    Slots and locations are unchanged, adding or removing a slot copies the array.
+        """
+        self.sparse = sparse
+        self.array: ArrayR[tuple[K, V] | InfiniteHashTable[K, V] | None] | None = None if sparse else ArrayR(self.TABLE_SIZE)
         self.count = 0# Number of items stored in the table
         self.level = level  # Hierarchy level
         self.parent= parent
+        self.parent_index = parent_index  # Slot holding this table in its parent
+        # Bit i is set when slot i is occupied.
+        self.occupied = 0
+        # The character at the parent's level shared by every key in this table,
+        # or None if keys with different characters alias to its slot (and for the top-level table).
+        self.char: str | None = None
+        self.compressed = compressed
+        # In compressed mode, the characters at the levels skipped between the parent and this table,
+        # as in the key that created it. Every key in the table hashes the same way at those levels.
+        self.segment = ""
     
     def hash(self, key: K) -> int:
         if self.level < len(key):
             return ord(key[self.level]) % (self.TABLE_SIZE-1)
         return self.TABLE_SIZE-1
 
+    def _slot(self, index: int) -> tuple[K, V] | InfiniteHashTable[K, V] | None:
+        """
+        Returns what is in slot index.
+        """
+        if not self.sparse:
+            return self.array[index]
+        bit = 1 << index
+        if not self.occupied & bit:
+            return None
+        return self.array[(self.occupied & (bit - 1)).bit_count()]
+
+    def _set_slot(self, index: int, item: tuple[K, V] | InfiniteHashTable[K, V] | None) -> None:
+        """
+        Puts item in slot index, or empties it if item is None, keeping occupied up to date.
+
+        :complexity: O(1), O(number of occupied slots) in sparse mode when a slot is filled or emptied.
+        """
+        bit = 1 << index
+        if not self.sparse:
+            self.array[index] = item
+        elif self.occupied & bit and item is not None:
+            self.array[(self.occupied & (bit - 1)).bit_count()] = item
+        elif self.occupied & bit or item is not None:
+            # Copy the occupied slots into an array one longer or shorter, skipping or inserting at index.
+            position = (self.occupied & (bit - 1)).bit_count()
+            size = self.occupied.bit_count() + (1 if item is not None else -1)
+            array = ArrayR(size) if size > 0 else None
+            for i in range(position):
+                array[i] = self.array[i]
+            if item is not None:
+                array[position] = item
+                for i in range(position, size - 1):
+                    array[i + 1] = self.array[i]
+            else:
+                for i in range(position, size):
+                    array[i] = self.array[i + 1]
+            self.array = array
+        if item is None:
+            self.occupied &= ~bit
+        else:
+            self.occupied |= bit
+
     def __getitem__(self, key: K) -> V:
         """
         Get the value at a certain key
@@ -39,7 +104,7 @@ class InfiniteHashTable(Generic[K, V]):
         :raises KeyError: when the key doesn't exist.
         """
         index = self.hash(key)
-        item = self.array[index]
+        item = self._slot(index) if self.sparse else self.array[index]
 
         if isinstance(item, InfiniteHashTable):
             return item[key]
@@ -51,69 +116,134 @@ class InfiniteHashTable(Generic[K, V]):
     def __setitem__(self, key: K, value: V) -> None:
         """
         Set an (key, value) pair in our hash table.
+
+        :complexity: O(len(key))
         """
         index = self.hash(key)
-        item = self.array[index]
+        item = self._slot(index) if self.sparse else self.array[index]
         
 
         if isinstance(item, InfiniteHashTable):
+            if item.compressed and item._segment_mismatch(key) is not None:
+                item = self._split(index, item._segment_mismatch(key))
+            if index != self.TABLE_SIZE - 1 and (item.char != key[self.level] or
+                                                 key[self.level + 1:item.level] != item.segment):
+                item.char = None
+            count = len(item)
             item[key] = value  # Recursive set, count managed by sub-table
-            self.count += 1
+            self.count += len(item) - count  # Unchanged when an existing key was updated
         elif item is None:
-            self.array[index] = (key, value)
+            self._set_slot(index, (key, value))
             self.count += 1  # Increment only if a new item is added
         elif item[0] == key:
-            self.array[index] = (key, value)  # Update existing item, count unchanged
+            self._set_slot(index, (key, value))  # Update existing item, count unchanged
             
         else:
             # Handle collisions by creating a nested hash table
-            new_table = InfiniteHashTable(self.level + 1, self)
+            level = self.level + 1
+            if self.compressed:
+                # Skip the levels where both keys still hash the same way.
+                while level < min(len(key), len(item[0])) and self._bucket(key[level]) == self._bucket(item[0][level]):
+                    level += 1
+            new_table = InfiniteHashTable(level, self, index, self.compressed, self.sparse)
+            new_table.segment = key[self.level + 1:level]
+            if index != self.TABLE_SIZE - 1 and item[0][self.level:level] == key[self.level:level]:
+                new_table.char = key[self.level]
             new_table[item[0]] = item[1]
             new_table[key] = value
-            self.array[index] = new_table
+            self._set_slot(index, new_table)
             self.count += 1  # Increment for the new key; existing moved to new_table
+
+    def _bucket(self, char: str) -> int:
+        """
+        The slot a character hashes to (see hash).
+        """
+        return ord(char) % (self.TABLE_SIZE-1)
+
+    def _segment_mismatch(self, key: K) -> int | None:
+        """
+        Returns the first level in this table's segment where key does not hash like the segment,
+        or ends, or None if key hashes like the whole segment.
+        """
+        start = self.level - len(self.segment)
+        for i, char in enumerate(self.segment):
+            if start + i >= len(key) or self._bucket(key[start + i]) != self._bucket(char):
+                return start + i
+        return None
+
+    def _split(self, index: int, level: int) -> InfiniteHashTable[K, V]:
+        """
+        Puts a new table at the given level of the segment of the sub-table in slot index,
+        between this table and that sub-table. Returns the new table.
+        """
+        child = self._slot(index)
+        start = child.level - len(child.segment)
+        middle = InfiniteHashTable(level, self, index, True, self.sparse)
+        middle.segment = child.segment[:level - start]
+        middle.count = child.count
+        middle.char = child.char
+        slot = middle._bucket(child.segment[level - start])
+        if child.char is not None:
+            child.char = child.segment[level - start]
+        child.segment = child.segment[level - start + 1:]
+        child.parent = middle
+        child.parent_index = slot
+        middle._set_slot(slot, child)
+        self._set_slot(index, middle)
+        return middle
+
     def __delitem__(self, key: K) -> None:
         """
         Deletes a (key, value) pair in our hash table.
+        A sub-table left with a single key is replaced by that key in its parent's slot,
+        and this carries on up as long as the parent is left with a single key too.
 
+        :complexity: O(len(key))
         :raises KeyError: when the key doesn't exist.
         """
-        index = self.hash(key)
-        item = self.array[index]
+        table = self
+        index = table.hash(key)
+        item = table._slot(index) if table.sparse else table.array[index]
+        while isinstance(item, InfiniteHashTable):
+            table = item
+            index = table.hash(key)
+            item = table._slot(index) if table.sparse else table.array[index]
+        if item is None or item[0] != key:
+            raise KeyError("Key not found")
 
-        if isinstance(item, InfiniteHashTable):
-            del item[key]
-            if len(item) == 1:  # Collapse sub-table into a single entry
-                for sub_key in range(item.TABLE_SIZE):
-                    sub_item = item.array[sub_key]
-                    if sub_item is not None:
-                        self.array[index] = sub_item
-                        break
-            if len(item) == 0:  # If the sub-table is empty after deletion
-                self.array[index] = None
-            self.count -= 1
-            # Check for collapsing into parent if this table now has one item
-            if self.count == 1 and self.parent:
-                for parent_index in range(self.parent.TABLE_SIZE):
-                    if self.parent.array[parent_index] is self:
-                        for i in range(self.TABLE_SIZE):
-                            if self.array[i] is not None:
-                                self.parent.array[parent_index] = self.array[i]
-                                break
+        table._set_slot(index, None)
+        # Every table on the way down lost a key.
+        current = table
+        while True:
+            current.count -= 1
+            if current is self:
+                break
+            current = current.parent
 
-        elif item is not None and item[0] == key:
-            self.array[index] = None
-            self.count -= 1
-            if self.count == 1 and self.parent:
-                for parent_index in range(self.parent.TABLE_SIZE):
-                    if self.parent.array[parent_index] is self:
-                        for i in range(self.TABLE_SIZE):
-                            if self.array[i] is not None:
-                                self.parent.array[parent_index] = self.array[i]
-                                break
+        # Tables below a collapsed one have collapsed already, so a single key is always an entry.
+        while table is not self and table.count == 1:
+            survivor = table._slot(table.occupied.bit_length() - 1)
+            table.parent._set_slot(table.parent_index, survivor)
+            table = table.parent
 
-        else:
-            raise KeyError("Key not found")
+        # In compressed mode, a table left with a single sub-table is merged into it.
+        if table is not self and table.compressed and table.occupied & (table.occupied - 1) == 0:
+            table._merge_child()
+
+    def _merge_child(self) -> None:
+        """
+        Replaces this table, whose only occupied slot holds a sub-table, by that sub-table in the parent.
+        """
+        child = self._slot(self.occupied.bit_length() - 1)
+        # Any key in the child gives the character at this level, up to aliasing.
+        item = child
+        while isinstance(item, InfiniteHashTable):
+            item = item._slot(item.occupied.bit_length() - 1)
+        child.segment = self.segment + (child.char if child.char is not None else item[0][self.level]) + child.segment
+        child.char = self.char if child.char is not None else None
+        child.parent = self.parent
+        child.parent_index = self.parent_index
+        self.parent._set_slot(self.parent_index, child)
 
     def __len__(self) -> int:
          return self.count
@@ -137,7 +267,7 @@ class InfiniteHashTable(Generic[K, V]):
         while isinstance(current_table, InfiniteHashTable):
             index = current_table.hash(key)
             location.append(index)
-            item = current_table.array[index]
+            item = current_table._slot(index) if current_table.sparse else current_table.array[index]
 
             if isinstance(item, InfiniteHashTable):
                 current_table = item
@@ -163,24 +293,179 @@ class InfiniteHashTable(Generic[K, V]):
     def sort_keys(self, current=None) -> list[str]:
         """
         Returns all keys currently in the table in lexicographically sorted order.
+        current = t: returns the keys in sub-table t instead.
+
+        :complexity: See iter_sorted_keys.
         """
         # If current is None, we start from the top-level table
         if current is None:
             current = self
+        return list(current.iter_sorted_keys())
+
+    def iter_sorted_keys(self) -> Iterator[str]:
+        """
+        Lazily yields all keys in the table in lexicographically sorted order, by walking the tables in order.
+
+        Every key in a table shares the characters on the path to it, so the key ending at this level
+        (in the terminal slot) comes first, followed by the other slots in order of their character.
+        Characters that alias to the same slot (ord(c) % 26) break this, so a table holding them is
+        sorted locally and merged with its siblings.
 
-        keys = []
-        for item in current.array:
-            if isinstance(item, tuple) and item[0] is not None:
-                # Direct key-value pair, add the key
-                keys.append(item[0])
+        :complexity: O(N * (len(key) + log(TABLE_SIZE))) without aliasing, where N is the number of keys.
+                     Memory is bounded by the depth of the tables, not by N.
+        """
+        children = self._children()
+        if all(char is not None for char, _ in children):
+            children.sort(key=lambda child: child[0])
+            for _, item in children:
+                if isinstance(item, InfiniteHashTable):
+                    yield from item.iter_sorted_keys()
+                else:
+                    yield item[0]
+            return
+
+        streams = []
+        for char, item in children:
+            if not isinstance(item, InfiniteHashTable):
+                streams.append(iter([item[0]]))
+            elif char is None:
+                streams.append(iter(sorted(item._iter_keys())))
+            else:
+                streams.append(item.iter_sorted_keys())
+        yield from merge(*streams)
+
+    def _children(self) -> list[tuple[str | None, tuple[K, V] | InfiniteHashTable[K, V]]]:
+        """
+        Returns the occupied slots as (character, item) pairs, in slot order.
+        The character is the one at this level: "" for the terminal slot, whose key ends here,
+        and None for a sub-table holding aliased characters.
+        """
+        children = []
+        for index in range(self.TABLE_SIZE):
+            item = self._slot(index) if self.sparse else self.array[index]
+            if item is None:
+                continue
+            if index == self.TABLE_SIZE - 1:
+                # The key ending at this level is a prefix of every other key here.
+                char = ""
             elif isinstance(item, InfiniteHashTable):
-                # Sub-table found, recurse into it
-                keys.extend(self.sort_keys(current=item))
-        
-        # Only sort at the top level for efficiency
-        if current is self:
-            keys.sort()
+                char = item.char
+            else:
+                char = item[0][self.level]
+            children.append((char, item))
+        return children
 
-        return keys
-        
-        
\ No newline at end of file
+    def iter_prefix(self, prefix: str) -> Iterator[str]:
+        """
+        Lazily yields the keys starting with prefix, in sorted order.
+        Descends one table per character of prefix, then walks only the table reached.
+
+        :complexity: O(len(prefix) + output) without aliasing, see iter_sorted_keys.
+        """
+        table, exact = self._prefix_table(prefix)
+        if table is None:
+            return
+        if not isinstance(table, InfiniteHashTable):
+            if table[0].startswith(prefix):
+                yield table[0]
+            return
+        if exact:
+            yield from table.iter_sorted_keys()
+        else:
+            # Below a sub-table holding aliased characters, keys can differ before this table's level,
+            # so walking its slots in order does not sort them.
+            yield from (key for key in sorted(table._iter_keys()) if key.startswith(prefix))
+
+    def count_prefix(self, prefix: str) -> int:
+        """
+        Returns the number of keys starting with prefix.
+
+        :complexity: O(len(prefix)) without aliasing, otherwise O(len(prefix) + K)
+                     where K is the number of keys in the table reached.
+        """
+        table, exact = self._prefix_table(prefix)
+        if table is None:
+            return 0
+        if not isinstance(table, InfiniteHashTable):
+            return int(table[0].startswith(prefix))
+        if exact:
+            return len(table)
+        return sum(1 for key in table._iter_keys() if key.startswith(prefix))
+
+    def _prefix_table(self, prefix: str) -> tuple[tuple[K, V] | InfiniteHashTable[K, V] | None, bool]:
+        """
+        Follows the slots for the characters of prefix, stopping early at an entry or empty slot.
+        Returns what was reached, and whether every key under it is known to start with prefix
+        (false if a sub-table on the way holds aliased characters).
+        (None, True) means no key starts with prefix.
+        """
+        item = self
+        exact = True
+        level = 0
+        while level < len(prefix):
+            if not isinstance(item, InfiniteHashTable):
+                return item, False
+            item = item._slot(ord(prefix[level]) % (self.TABLE_SIZE - 1))
+            if isinstance(item, InfiniteHashTable):
+                # The characters from this level down to the sub-table's own level, cut short by the prefix.
+                edge = prefix[level:item.level]
+                if item.char is None:
+                    exact = False
+                elif edge != (item.char + item.segment)[:len(edge)]:
+                    return None, True
+                level = item.level
+            else:
+                level += 1
+        return item, exact
+
+    def iter_range(self, lo: str | None = None, hi: str | None = None) -> Iterator[str]:
+        """
+        Lazily yields the keys with lo <= key < hi, in sorted order.
+        lo = None or hi = None leaves that side unbounded.
+        Sub-tables whose keys all fall below lo are skipped, and the walk stops at the first key from hi on.
+
+        :complexity: O(len(lo) * TABLE_SIZE + output) without aliasing, see iter_sorted_keys.
+        """
+        yield from self._iter_range("", lo, hi)
+
+    def _iter_range(self, prefix: str, lo: str | None, hi: str | None) -> Iterator[str]:
+        """
+        iter_range over this table, whose keys all start with prefix.
+        """
+        children = self._children()
+        if any(char is None for char, _ in children):
+            # Aliased characters: filter the ordered keys instead of pruning.
+            for key in self.iter_sorted_keys():
+                if hi is not None and key >= hi:
+                    return
+                if lo is None or key >= lo:
+                    yield key
+            return
+
+        children.sort(key=lambda child: child[0])
+        for char, item in children:
+            if not isinstance(item, InfiniteHashTable):
+                key = item[0]
+                if hi is not None and key >= hi:
+                    return
+                if lo is None or key >= lo:
+                    yield key
+                continue
+            # Every key in the sub-table starts with sub_prefix.
+            sub_prefix = prefix + char + item.segment
+            if lo is not None and sub_prefix < lo[:len(sub_prefix)]:
+                continue
+            if hi is not None and sub_prefix > hi[:len(sub_prefix)]:
+                return
+            yield from item._iter_range(sub_prefix, lo, hi)
+
+    def _iter_keys(self) -> Iterator[K]:
+        """
+        Yields all keys in the table, in no particular order.
+        """
+        # Both layouts hold only entries, sub-tables and empty slots; a sparse table with none has no array.
+        for item in self.array or ():
+            if isinstance(item, InfiniteHashTable):
+                yield from item._iter_keys()
+            elif item is not None:
+                yield item[0]
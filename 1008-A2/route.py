@@ -1,7 +1,7 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from computer import Computer
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Callable, Iterator, Sequence, Union
 from branch_decision import BranchDecision
 
 if TYPE_CHECKING:
@@ -60,7 +60,7 @@ class RouteSeries:
         post: Creating a new route where a computer is removed from the beginning of the series.
 
         """
-        return Route(Route(None), self.following.store) 
+        return self.following.store
 
 
     def add_computer_before(self, computer: Computer) -> RouteStore:
@@ -133,6 +133,9 @@ class RouteSeries:
 
 RouteStore = Union[RouteSplit, RouteSeries, None]
 
+# A path is a sequence of steps ("top", "bottom" or "following") leading from a route to one of its sub-routes.
+RoutePath = Sequence[str]
+
 @dataclass
 class Route:
     """
@@ -165,6 +168,103 @@ class Route:
         """
         return Route(RouteSplit(Route(None), Route(None), self))
 
+    def route_at(self, path: RoutePath) -> Route:
+        """
+        Returns the sub-route reached by following path from this route.
+
+        :complexity: O(D) where D is len(path).
+        :raises ValueError: when a step cannot be taken from the store it is applied to.
+        """
+        current = self
+        for step in path:
+            current = getattr(current.store, self._check_step(current.store, step))
+        return current
+
+    def replace_at(self, path: RoutePath, route: Route) -> Route:
+        """
+        Returns a *new* route where the sub-route at path is replaced by route.
+        Only the D routes along the path are copied, everything else is shared with this route.
+
+        :complexity: O(D) where D is len(path).
+        :raises ValueError: when a step cannot be taken from the store it is applied to.
+        """
+        return self._edit_at(path, lambda _: route)
+
+    def add_computer_at(self, path: RoutePath, computer: Computer) -> Route:
+        """
+        Returns a *new* route where computer is added before the sub-route at path.
+
+        :complexity: O(D) where D is len(path).
+        """
+        return self._edit_at(path, lambda target: target.add_computer_before(computer))
+
+    def add_empty_branch_at(self, path: RoutePath) -> Route:
+        """
+        Returns a *new* route where an empty branch is added before the sub-route at path.
+
+        :complexity: O(D) where D is len(path).
+        """
+        return self._edit_at(path, lambda target: target.add_empty_branch_before())
+
+    def replace_computer_at(self, path: RoutePath, computer: Computer) -> Route:
+        """
+        Returns a *new* route where the computer heading the sub-route at path is replaced.
+
+        :complexity: O(D) where D is len(path).
+        :raises ValueError: when the sub-route at path does not start with a computer.
+        """
+        def edit(target: Route) -> Route:
+            if type(target.store) != RouteSeries:
+                raise ValueError("No computer to replace at this path")
+            return Route(RouteSeries(computer, target.store.following))
+        return self._edit_at(path, edit)
+
+    def remove_at(self, path: RoutePath) -> Route:
+        """
+        Returns a *new* route where the computer or branch heading the sub-route at path is removed,
+        leaving only what follows it.
+
+        :complexity: O(D) where D is len(path).
+        :raises ValueError: when the sub-route at path is empty.
+        """
+        def edit(target: Route) -> Route:
+            if type(target.store) == RouteSeries:
+                return Route(target.store.remove_computer())
+            elif type(target.store) == RouteSplit:
+                return Route(target.store.remove_branch())
+            raise ValueError("Nothing to remove at this path")
+        return self._edit_at(path, edit)
+
+    def _edit_at(self, path: RoutePath, edit: Callable[[Route], Route]) -> Route:
+        """
+        Applies edit to the sub-route at path, then copies every store on the
+        way back up so that each ancestor points to the edited route.
+
+        :complexity: O(D + edit) where D is len(path).
+        """
+        ancestors = []
+        current = self
+        for step in path:
+            step = self._check_step(current.store, step)
+            ancestors.append((current.store, step))
+            current = getattr(current.store, step)
+
+        result = edit(current)
+        for store, step in reversed(ancestors):
+            result = Route(replace(store, **{step: result}))
+        return result
+
+    @staticmethod
+    def _check_step(store: RouteStore, step: str) -> str:
+        """
+        :raises ValueError: when step cannot be taken from store.
+        """
+        if type(store) == RouteSplit and step in ("top", "bottom", "following"):
+            return step
+        if type(store) == RouteSeries and step == "following":
+            return step
+        raise ValueError(f"Cannot take step {step!r} from {type(store).__name__}")
+
     def follow_path(self, virus_type: VirusType) -> None: #TODO
         """
         Follow a path and add computers according to a virus_type.
@@ -217,21 +317,29 @@ class Route:
                 else:
                     stop = True
 
+    def iter_computers(self) -> Iterator[Computer]:
+        """
+        Lazily yields all computers on the route, in the same order as add_all_computers.
+        Uses an explicit stack, so long routes do not hit the recursion limit.
+
+        :complexity: O(N) where N is the number of route components.
+        """
+        stack = [self]
+        while stack:
+            store = stack.pop().store
+            if type(store) == RouteSeries:
+                yield store.computer
+                stack.append(store.following)
+            elif type(store) == RouteSplit:
+                # Pushed in reverse so top is visited first.
+                stack.append(store.following)
+                stack.append(store.bottom)
+                stack.append(store.top)
+
     def add_all_computers(self) -> list[Computer]:
         """
         Returns a list of all computers on the route.
-        
-        param:
-        return:
-        post:
 
+        :complexity: O(N) where N is the number of route components.
         """
-        if self.store is None:
-            return []
-        elif type(self.store) == RouteSeries:
-            return [self.store.computer] + self.store.following.add_all_computers()
-        elif type(self.store) == RouteSplit:
-            return (self.store.top.add_all_computers() +
-                    self.store.bottom.add_all_computers() +
-                    self.store.following.add_all_computers())
-        return []
\ No newline at end of file
+        return list(self.iter_computers())
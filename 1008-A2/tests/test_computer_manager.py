@@ -1,4 +1,5 @@
 import unittest
+import importlib.util
 from ed_utils.decorators import number
 
 from computer import Computer
@@ -103,3 +104,128 @@ class TestComputerManager(unittest.TestCase):
         self.assertEqual(len(res), 4)
 
         self.assertEqual(self.make_set(res[3]), self.make_set([c8]))
+
+    @number("6.3")
+    def test_edit_remove(self):
+        c1 = Computer("c1", 2, 2, 0.1)
+        c2 = Computer("c2", 2, 9, 0.2)
+        c3 = Computer("c3", 3, 6, 0.3)
+        c4 = Computer("c4", 5, 1, 0.4)
+        c5 = Computer("c5", 2, 6, 0.5)
+
+        cm = ComputerManager()
+        for c in [c1, c2, c3]:
+            cm.add_computer(c)
+
+        # Removing from the middle of a bucket keeps the rest of the bucket.
+        cm.remove_computer(c1)
+        self.assertEqual(self.make_set(cm.computers_with_difficulty(2)), self.make_set([c2]))
+
+        # Editing to a new difficulty moves the computer between buckets.
+        cm.edit_computer(c2, c4)
+        res = cm.group_by_difficulty()
+        self.assertEqual(len(res), 2)
+        self.assertEqual(self.make_set(res[0]), self.make_set([c3]))
+        self.assertEqual(self.make_set(res[1]), self.make_set([c4]))
+
+        # Editing within a bucket replaces in place.
+        cm.edit_computer(c4, Computer("c4", 5, 1, 0.4))
+        self.assertEqual(len(cm.computers_with_difficulty(5)), 1)
+        self.assertNotIn(id(c4), self.make_set(cm.computers_with_difficulty(5)))
+
+        # Removing an equal (but not identical) computer still works.
+        cm.add_computer(c5)
+        cm.remove_computer(Computer("c5", 2, 6, 0.5))
+        self.assertEqual(cm.computers_with_difficulty(2), [])
+        self.assertEqual(len(cm), 2)
+
+    @number("6.4")
+    def test_computer_table(self):
+        from computer import FrozenComputer
+        from computer_organiser import ComputerOrganiser
+        from computer_table import ComputerTable
+
+        computers = [Computer("c1", 2, 2, 0.1), Computer("c2", 3, 9, 0.2), Computer("c3", 2, 6, 0.3)]
+        table = ComputerTable(computers)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table[1].name, "c2")
+        self.assertEqual(table[-1].to_computer(), computers[2])
+        self.assertEqual(table.to_computers(), computers)
+        self.assertEqual(table[0], table[0])
+
+        cm = ComputerManager()
+        cm.add_computers(table)
+        self.assertEqual({row.name for row in cm.computers_with_difficulty(2)}, {"c1", "c3"})
+        cm.remove_computer(table[0])
+        self.assertEqual([row.name for row in cm.computers_with_difficulty(2)], ["c3"])
+
+        for backend in ComputerOrganiser.BACKENDS:
+            co = ComputerOrganiser(backend)
+            co.add_computers(table)
+            self.assertEqual([co.cur_position(row) for row in table], [0, 2, 1])
+
+        frozen = FrozenComputer.from_computer(computers[0])
+        self.assertFalse(hasattr(frozen, "__dict__"))
+        self.assertEqual(frozen.sort_key, computers[0].sort_key)
+        self.assertEqual(len({frozen, FrozenComputer("c1", 2, 2, 0.1)}), 1)
+
+    @number("6.5")
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+    def test_query(self):
+        computers = [
+            Computer("c1", 2, 2, 0.1), Computer("c2", 3, 9, 0.2), Computer("c3", 3, 6, 0.9),
+            Computer("c4", 5, 1, 0.4), Computer("c5", 7, 6, 0.5), Computer("c6", 2, 8, 0.3),
+        ]
+        cm = ComputerManager()
+        cm.add_computers(computers)
+        q = cm.query()
+
+        matches = q.filter(difficulty=(2, 5), risk_below=0.5)
+        ordered = q.order_by("hacked_value", matches, descending=True)
+        self.assertEqual([c.name for c in q.select(ordered)], ["c2", "c6", "c1", "c4"])
+
+        self.assertEqual([c.name for c in q.select(q.top_k("hacked_value", 2))], ["c2", "c6"])
+        self.assertEqual([c.name for c in q.select(q.top_k("risk_factor", 1, largest=False))], ["c1"])
+
+        diffs, totals = q.group_by_difficulty("hacked_value", "sum")
+        self.assertEqual(diffs.tolist(), [2, 3, 5, 7])
+        self.assertEqual(totals.tolist(), [10, 15, 1, 6])
+        _, counts = q.group_by_difficulty("hacked_value", "count")
+        self.assertEqual(counts.tolist(), [2, 2, 1, 1])
+        _, highest = q.group_by_difficulty("risk_factor", "max")
+        self.assertEqual(highest.tolist(), [0.3, 0.9, 0.4, 0.5])
+        self.assertRaises(ValueError, lambda: q.group_by_difficulty("risk_factor", "median"))
+
+    @number("6.6")
+    def test_duplicates_and_reassignment(self):
+        c1 = Computer("c1", 2, 2, 0.1)
+        c2 = Computer("c2", 2, 9, 0.2)
+
+        # The same object can be stored more than once, and is removed one copy at a time.
+        cm = ComputerManager()
+        cm.add_computer(c1)
+        cm.add_computer(c2)
+        cm.add_computer(c1)
+        self.assertEqual(len(cm), 3)
+        cm.remove_computer(c1)
+        self.assertEqual(len(cm), 2)
+        self.assertEqual(self.make_set(cm.computers_with_difficulty(2)), self.make_set([c1, c2]))
+        cm.remove_computer(c1)
+        cm.remove_computer(c1)
+        self.assertEqual(cm.computers_with_difficulty(2), [c2])
+        self.assertEqual(len(cm), 1)
+
+        # A reassigned difficulty is picked up by edit_computer(c, c), and removal works either way.
+        cm.add_computer(c1)
+        c1.hacking_difficulty = 4
+        cm.edit_computer(c1, c1)
+        self.assertEqual(cm.computers_with_difficulty(2), [c2])
+        self.assertEqual(cm.computers_with_difficulty(4), [c1])
+        c2.hacking_difficulty = 5
+        cm.remove_computer(c2)
+        self.assertEqual(cm.computers_with_difficulty(2), [])
+        self.assertEqual(len(cm), 1)
+
+        # computers is a read-only snapshot.
+        self.assertEqual(cm.computers, (c1,))
+        self.assertRaises(AttributeError, lambda: cm.computers.append(c2))
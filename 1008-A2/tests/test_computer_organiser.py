@@ -47,3 +47,62 @@ class TestComputerOrganiser(unittest.TestCase):
         co.add_computers([c5, c6, c7])
         co.add_computers([c8, c9, c10])
         self.assertEqual([co.cur_position(c) for c in [c1, c2, c3, c4, c5, c6, c7, c8, c9, c10]], [0, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+
+    @number("5.3")
+    def test_backends(self):
+        c1 = Computer("c1", 2, 2, 0.1)
+        c2 = Computer("c2", 9, 2, 0.2)
+        c3 = Computer("c3", 6, 3, 0.3)
+        c4 = Computer("c4", 1, 3, 0.4)
+        c5 = Computer("c5", 6, 4, 0.5)
+
+        for backend in ComputerOrganiser.BACKENDS:
+            co = ComputerOrganiser(backend)
+            co.add_computers([c1, c2])
+            co.add_computers([c4, c3])
+            co.add_computers([c5])
+            self.assertEqual(co.sorted_computers, [c4, c1, c3, c5, c2])
+            co.remove_computer(c3)
+            self.assertEqual([co.cur_position(c) for c in [c4, c1, c5, c2]], [0, 1, 2, 3])
+            self.assertRaises(KeyError, lambda: co.cur_position(c3))
+            self.assertRaises(KeyError, lambda: co.remove_computer(c3))
+
+        self.assertRaises(ValueError, lambda: ComputerOrganiser("tree"))
+
+    @number("5.4")
+    def test_sort_key(self):
+        from algorithms.binary_search import binary_search
+        from algorithms.mergesort import mergesort
+
+        c1, c2, c3 = Computer("b", 1, 5, 0.5), Computer("a", 1, 9, 0.5), Computer("a", 0, 1, 0.9)
+        self.assertEqual(c1.sort_key, (1, 0.5, "b"))
+        self.assertTrue(c2 < c1 and c3 < c2 and c1 >= c2)
+        self.assertEqual(mergesort([c1, c2, c3]), [c3, c2, c1])
+        self.assertEqual(mergesort([c1, c2, c3], key=lambda c: -c.hacked_value), [c2, c1, c3])
+        self.assertEqual(binary_search([c3, c2, c1], c2, key=lambda c: c.sort_key), 1)
+
+        # Reassigning an ordering field needs an explicit refresh of the cached key.
+        c3.hacking_difficulty = 5
+        self.assertEqual(c3.sort_key, (0, 0.9, "a"))
+        c3.refresh_sort_key()
+        self.assertEqual(c3.sort_key, (5, 0.9, "a"))
+        self.assertEqual(mergesort([c1, c2, c3]), [c2, c1, c3])
+
+    @number("5.5")
+    def test_sorted_computers_view(self):
+        c1, c2, c3 = Computer("c1", 2, 2, 0.1), Computer("c2", 9, 2, 0.2), Computer("c3", 6, 3, 0.3)
+        for backend in ComputerOrganiser.BACKENDS:
+            co = ComputerOrganiser(backend)
+            view = co.sorted_computers
+            co.add_computers([c1, c2])
+            co.add_computers([c3])
+            # The view follows later changes, and indexes without copying.
+            self.assertEqual(len(view), 3)
+            self.assertEqual([view[i] for i in range(len(view))], [c1, c3, c2])
+            self.assertEqual(view[-1], c2)
+            self.assertEqual(view[1:], [c3, c2])
+            self.assertEqual(list(view), [c1, c3, c2])
+            self.assertRaises(IndexError, lambda: view[3])
+            self.assertRaises(AttributeError, lambda: view.append(c1))
+            co.remove_computer(c3)
+            self.assertEqual(view, [c1, c2])
@@ -137,3 +137,190 @@ class TestDoubleHash(unittest.TestCase):
         # with an iterator.
         self.assertRaises(BaseException, lambda: next(key_iterator))
         self.assertRaises(BaseException, lambda: next(value_iterator))
+
+    @number("3.6")
+    def test_sub_table_hash_bound_once(self):
+        class TestingDKT(DoubleKeyTable):
+            def hash2(self, k, sub_table):
+                return ord(k[-1]) % sub_table.table_size
+
+        dt = TestingDKT()
+        dt["Tim", "Bob"] = 1
+        position1, _ = dt._linear_probe("Tim", "Bob", False)
+        sub_table = dt.array[position1][1]
+        bound = sub_table.hash
+        for i in range(20):
+            dt["Tim", f"Bo{chr(97 + i)}"] = i
+            self.assertEqual(dt["Tim", "Bob"], 1)
+        # The same hash function survives lookups, inserts and the internal table's rehashes.
+        self.assertGreater(sub_table.table_size, 5)
+        self.assertIs(sub_table.hash, bound)
+        self.assertEqual(sub_table.hash("Bob"), ord("b") % sub_table.table_size)
+        self.assertEqual(dt["Tim", "Bof"], 5)
+
+    @number("3.7")
+    def test_double_key_hashed_lookup(self):
+        from data_structures.probing import STRATEGIES
+
+        # Every key1 shares a home slot, so they all sit in one probe cluster.
+        class TestingDKT(DoubleKeyTable):
+            def hash1(self, k):
+                return 0
+
+        key1s = [f"virus-{i}" for i in range(8)]
+        for strategy in STRATEGIES:
+            dt = TestingDKT(sizes=[29], probing=strategy)
+            for key1 in key1s:
+                dt[key1, "a"] = 1
+                dt[key1, "b"] = 2
+            # Deleting one key1 from the middle of the cluster keeps the rest reachable.
+            del dt[key1s[2], "a"]
+            del dt[key1s[2], "b"]
+            self.assertEqual(len(dt), 7)
+            self.assertRaises(KeyError, lambda: dt.keys(key1s[2]))
+            self.assertRaises(KeyError, lambda: list(dt.iter_values(key1s[2])))
+            for key1 in key1s[:2] + key1s[3:]:
+                self.assertEqual(set(dt.keys(key1)), {"a", "b"})
+                self.assertEqual(set(dt.iter_keys(key1)), {"a", "b"})
+                self.assertEqual(set(dt.values(key1)), {1, 2})
+                self.assertEqual(set(dt.iter_values(key1)), {1, 2})
+                self.assertEqual(dt[key1, "b"], 2)
+            self.assertEqual(set(dt.iter_keys()), set(key1s) - {key1s[2]})
+            self.assertRaises(KeyError, lambda: dt.__delitem__((key1s[2], "a")))
+            self.assertRaises(KeyError, lambda: dt.__delitem__((key1s[3], "c")))
+            # Without contiguous clusters the slot is left as a tombstone, and reused by the next new key1.
+            self.assertEqual(dt.tombstones, 0 if strategy.CLUSTER_DELETE else 1)
+            dt[key1s[2], "c"] = 3
+            self.assertEqual(dt.tombstones, 0)
+            self.assertEqual(dt[key1s[2], "c"], 3)
+
+        # Tombstones are compacted away before they fill the table.
+        for strategy in STRATEGIES:
+            dt = DoubleKeyTable(probing=strategy)
+            for i in range(2000):
+                dt[f"virus-{i}", "a"] = i
+                if i >= 10:
+                    del dt[f"virus-{i - 10}", "a"]
+                self.assertLessEqual(dt.tombstones, (dt.table_size - len(dt)) * dt.TOMBSTONE_RATIO)
+            self.assertEqual(len(dt), 10)
+            self.assertEqual(set(dt.keys()), {f"virus-{i}" for i in range(1990, 2000)})
+            self.assertEqual(sorted(dt.values()), list(range(1990, 2000)))
+            self.assertEqual(len(dict(dt.scan(count=100)[0])), 10)
+
+    @number("3.8")
+    def test_double_key_iterators(self):
+        from data_structures.probing import STRATEGIES
+
+        dt = DoubleKeyTable()
+        for i in range(20):
+            dt[f"virus-{i % 4}", f"computer-{i}"] = i
+
+        # Changing a value is fine, adding or removing a pair is not.
+        it = dt.iter_values()
+        next(it)
+        dt["virus-0", "computer-0"] = -1
+        next(it)
+        dt["virus-9", "computer-9"] = 9
+        self.assertRaises(RuntimeError, lambda: next(it))
+        it = dt.iter_keys("virus-1")
+        next(it)
+        del dt["virus-1", "computer-1"]
+        self.assertRaises(RuntimeError, lambda: next(it))
+
+        for fast_hash in (False, True):
+            for strategy in STRATEGIES:
+                dt = DoubleKeyTable(probing=strategy, fast_hash=fast_hash)
+                for i in range(200):
+                    dt[f"virus-{i % 20}", f"computer-{i}"] = i
+                expected = {(f"virus-{i % 20}", f"computer-{i}"): i for i in range(200)}
+
+                page, cursor = dt.scan(count=30)
+                seen = dict(page)
+                saved = cursor
+                # Changes made during the scan, including resizes, do not affect it.
+                for i in range(200, 600):
+                    dt[f"virus-{i % 50}", f"computer-{i}"] = i
+                for i in range(0, 200, 2):
+                    del dt[f"virus-{i % 20}", f"computer-{i}"]
+                dt["virus-1", "computer-1"] = -1
+                while cursor is not None:
+                    self.assertEqual(len(page), 30)
+                    page, cursor = dt.scan(cursor, 30)
+                    seen.update(page)
+                self.assertEqual(seen, expected)
+
+                # A saved cursor can be resumed again.
+                page, _ = dt.scan(saved, 30)
+                self.assertEqual(len(page), 30)
+                self.assertTrue(set(page) <= set(expected.items()))
+
+                # The table itself saw every change.
+                self.assertEqual(dt["virus-1", "computer-1"], -1)
+                self.assertEqual(dt["virus-7", "computer-507"], 507)
+                self.assertNotIn(("virus-2", "computer-2"), dt)
+                self.assertEqual(sum(1 for _ in dt.iter_values()), 500)
+                self.assertEqual(len(dict(dt.scan(count=1000)[0])), 500)
+        self.assertRaises(ValueError, lambda: dt.scan(count=0))
+
+        # Once a scan is exhausted or closed, writes stop copying for its snapshot.
+        dt = DoubleKeyTable()
+        for i in range(20):
+            dt[f"virus-{i % 4}", f"computer-{i}"] = i
+        page, cursor = dt.scan(count=5)
+        array = dt.array
+        dt["virus-9", "computer-9"] = 9
+        self.assertIsNot(dt.array, array)
+        dt.close_scan(cursor)
+        dt.close_scan(cursor)
+        array = dt.array
+        dt["virus-8", "computer-8"] = 8
+        del dt["virus-8", "computer-8"]
+        self.assertIs(dt.array, array)
+        page, cursor = dt.scan(count=100)
+        self.assertIsNone(cursor)
+        self.assertEqual(len(page), 21)
+        dt["virus-7", "computer-7"] = 7
+        self.assertIs(dt.array, array)
+
+    @number("3.9")
+    def test_flat_double_key_table(self):
+        from data_structures.probing import STRATEGIES
+        from flat_double_key_table import FlatDoubleKeyTable
+
+        for strategy in STRATEGIES:
+            flat = FlatDoubleKeyTable(probing=strategy)
+            nested = DoubleKeyTable(probing=strategy)
+            for i in range(300):
+                for table in (flat, nested):
+                    table[f"virus-{i % 7}", f"computer-{i}"] = i
+            for i in range(0, 300, 3):
+                for table in (flat, nested):
+                    del table[f"virus-{i % 7}", f"computer-{i}"]
+            flat["virus-1", "computer-1"] = nested["virus-1", "computer-1"] = -1
+
+            # Same contents through the shared interface.
+            self.assertEqual(len(flat), len(nested))
+            self.assertEqual(set(flat.keys()), set(nested.keys()))
+            self.assertEqual(sorted(flat.values()), sorted(nested.values()))
+            self.assertEqual(set(flat.iter_keys()), set(nested.iter_keys()))
+            for key1 in nested.keys():
+                self.assertEqual(set(flat.keys(key1)), set(nested.keys(key1)))
+                self.assertEqual(set(flat.iter_keys(key1)), set(nested.iter_keys(key1)))
+                self.assertEqual(sorted(flat.values(key1)), sorted(nested.values(key1)))
+                self.assertEqual(sorted(flat.iter_values(key1)), sorted(nested.iter_values(key1)))
+            self.assertEqual(flat["virus-1", "computer-1"], -1)
+            self.assertNotIn(("virus-3", "computer-3"), flat)
+            self.assertRaises(KeyError, lambda: flat["virus-3", "computer-3"])
+            self.assertRaises(KeyError, lambda: flat.__delitem__(("virus-3", "computer-3")))
+
+        # Deleting the last key2 removes key1.
+        flat = FlatDoubleKeyTable()
+        flat["May", "Jim"] = 1
+        flat["Kim", "Tim"] = 2
+        it = flat.iter_values()
+        next(it)
+        del flat["May", "Jim"]
+        self.assertRaises(RuntimeError, lambda: next(it))
+        self.assertEqual(flat.keys(), ["Kim"])
+        self.assertRaises(KeyError, lambda: flat.keys("May"))
+        self.assertRaises(KeyError, lambda: list(flat.iter_values("May")))
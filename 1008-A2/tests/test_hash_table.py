@@ -0,0 +1,274 @@
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.hash_table import LinearProbeTable, TOMBSTONE
+
+
+class TestLinearProbeTable(unittest.TestCase):
+
+    @number("7.1")
+    def test_tombstones(self):
+        # Disable resizing / rehashing.
+        class TestingLPT(LinearProbeTable):
+            def hash(self, k):
+                return ord(k[0]) % 13
+
+        lpt = TestingLPT([13], tombstones=True)
+        lpt["Amy"] = 1
+        lpt["Ann"] = 2
+        lpt["Abe"] = 3
+        self.assertEqual(lpt._linear_probe("Abe", False), 2)
+
+        del lpt["Ann"]
+        # The slot is marked rather than the cluster being reinserted.
+        self.assertIs(lpt.array[1], TOMBSTONE)
+        self.assertEqual(lpt._linear_probe("Abe", False), 2)
+        self.assertEqual(len(lpt), 2)
+        self.assertRaises(KeyError, lambda: lpt["Ann"])
+        self.assertEqual(set(lpt.keys()), {"Amy", "Abe"})
+        self.assertEqual(set(lpt.values()), {1, 3})
+
+        # New keys reuse the tombstone.
+        lpt["Art"] = 4
+        self.assertEqual(lpt._linear_probe("Art", False), 1)
+        self.assertEqual(lpt.tombstones, 0)
+
+        # Compaction clears tombstones once they fill half the free slots.
+        for key in ["Bob", "Ben", "Bea", "Bud", "Bix"]:
+            lpt[key] = 0
+        for key in ["Bob", "Ben", "Bea", "Bud", "Bix", "Art"]:
+            del lpt[key]
+        self.assertLessEqual(lpt.tombstones, (lpt.table_size - len(lpt)) / 2)
+        self.assertEqual(set(lpt.keys()), {"Amy", "Abe"})
+        self.assertEqual(lpt["Abe"], 3)
+
+    @number("7.2")
+    def test_probing_strategies(self):
+        from data_structures.probing import STRATEGIES, QUADRATIC, ROBIN_HOOD
+        from double_key_table import DoubleKeyTable
+
+        keys = [f"key{i}" for i in range(200)]
+        for strategy in STRATEGIES:
+            lpt = LinearProbeTable(probing=strategy)
+            for i, key in enumerate(keys):
+                lpt[key] = i
+            for key in keys[::3]:
+                del lpt[key]
+            expected = {key: i for i, key in enumerate(keys) if i % 3}
+            self.assertEqual(len(lpt), len(expected))
+            self.assertEqual(dict(zip(lpt.keys(), lpt.values())), expected)
+            for key, value in expected.items():
+                self.assertEqual(lpt[key], value)
+
+            dt = DoubleKeyTable(probing=strategy)
+            for i, key in enumerate(keys):
+                dt[key[:4], key] = i
+            self.assertEqual(dt[keys[42][:4], keys[42]], 42)
+            self.assertEqual(set(dt.values()), set(range(200)))
+
+        # Only linear probing can delete by reinserting the cluster.
+        self.assertTrue(LinearProbeTable(probing=QUADRATIC).use_tombstones)
+        self.assertFalse(LinearProbeTable(probing=ROBIN_HOOD).use_tombstones)
+
+        # Robin Hood takes the slot of items closer to their home.
+        class TestingLPT(LinearProbeTable):
+            def hash(self, k):
+                return int(k[0])
+
+        lpt = TestingLPT([13], probing=ROBIN_HOOD)
+        lpt["0a"] = 1
+        lpt["0b"] = 2
+        lpt["1a"] = 3
+        self.assertEqual([lpt.array[i][0] for i in range(3)], ["0a", "0b", "1a"])
+        lpt["0c"] = 4
+        # 0c is 2 away from home at slot 2, while 1a is only 1 away, so 1a moves along.
+        self.assertEqual([lpt.array[i][0] for i in range(4)], ["0a", "0b", "0c", "1a"])
+
+    @number("7.3")
+    def test_fast_hash(self):
+        from data_structures.probing import STRATEGIES
+        from double_key_table import DoubleKeyTable
+
+        keys = [f"computer-{i}" for i in range(300)]
+        for strategy in STRATEGIES:
+            lpt = LinearProbeTable(probing=strategy, fast_hash=True)
+            for i, key in enumerate(keys):
+                lpt[key] = i
+            for key in keys[::4]:
+                del lpt[key]
+            # Each live entry caches its hash, which places it.
+            for i in range(lpt.table_size):
+                item = lpt.array[i]
+                if item is not None and item is not TOMBSTONE:
+                    self.assertEqual(lpt.hashes[i], lpt.key_hash(item[0]))
+            expected = {key: i for i, key in enumerate(keys) if i % 4}
+            self.assertEqual(dict(zip(lpt.keys(), lpt.values())), expected)
+            self.assertEqual(lpt.hash("x"), lpt.key_hash("x") % lpt.table_size)
+
+        # Resizing uses the cached hashes rather than hashing keys again.
+        class CountingLPT(LinearProbeTable):
+            calls = 0
+            def key_hash(self, key):
+                CountingLPT.calls += 1
+                return super().key_hash(key)
+
+        lpt = CountingLPT(fast_hash=True)
+        for key in keys:
+            lpt[key] = 0
+        calls = CountingLPT.calls
+        lpt._rehash()
+        self.assertEqual(CountingLPT.calls, calls)
+
+        dt = DoubleKeyTable(fast_hash=True)
+        for i, key in enumerate(keys):
+            dt[key[:10], key] = i
+        self.assertEqual(dt[keys[123][:10], keys[123]], 123)
+        self.assertEqual(set(dt.keys(keys[5][:10])), {key for key in keys if key[:10] == keys[5][:10]})
+
+    @number("7.4")
+    def test_load_factors(self):
+        from data_structures.probing import STRATEGIES
+        from double_key_table import DoubleKeyTable
+
+        self.assertRaises(ValueError, lambda: LinearProbeTable(max_load=0.5, min_load=0.5))
+        self.assertRaises(ValueError, lambda: LinearProbeTable(max_load=1.5))
+
+        keys = [f"computer-{i}" for i in range(1000)]
+        for strategy in STRATEGIES:
+            lpt = LinearProbeTable(probing=strategy)
+            for i, key in enumerate(keys):
+                lpt[key] = i
+            grown = lpt.size_index
+            for key in keys[10:]:
+                del lpt[key]
+            # Shrinks down through TABLE_SIZES, keeping every item.
+            self.assertLess(lpt.size_index, grown)
+            self.assertGreaterEqual(len(lpt), lpt.table_size * lpt.MIN_LOAD)
+            self.assertEqual(dict(zip(lpt.keys(), lpt.values())), {key: i for i, key in enumerate(keys[:10])})
+            # Hysteresis: deleting and re-inserting one key at the boundary does not resize.
+            size_index = lpt.size_index
+            for _ in range(5):
+                del lpt[keys[0]]
+                lpt[keys[0]] = 0
+            self.assertEqual(lpt.size_index, size_index)
+
+        # A custom max_load lets the table fill up further before growing.
+        lpt = LinearProbeTable(max_load=0.75, min_load=0)
+        for key in keys[:9]:
+            lpt[key] = 0
+        self.assertEqual(lpt.table_size, 13)
+        for key in keys[:9]:
+            del lpt[key]
+        # min_load=0 never shrinks.
+        self.assertEqual(lpt.table_size, 13)
+
+        dt = DoubleKeyTable()
+        for i, key in enumerate(keys):
+            dt[key, "x"] = i
+        grown = dt.table_size
+        for key in keys[5:]:
+            del dt[key, "x"]
+        self.assertEqual(len(dt), 5)
+        self.assertLess(dt.table_size, grown)
+        self.assertEqual(set(dt.keys()), set(keys[:5]))
+        self.assertEqual(dt[keys[3], "x"], 3)
+
+    @number("7.5")
+    def test_bulk_build(self):
+        from data_structures.probing import STRATEGIES
+        from double_key_table import DoubleKeyTable
+
+        class CountingLPT(LinearProbeTable):
+            resizes = 0
+            def _resize(self, size_index):
+                CountingLPT.resizes += 1
+                super()._resize(size_index)
+
+        items = [(f"computer-{i}", i) for i in range(1000)]
+        for strategy in STRATEGIES:
+            CountingLPT.resizes = 0
+            lpt = CountingLPT.from_items(items, probing=strategy)
+            # Sized once, to the smallest table within the load factor.
+            self.assertEqual(CountingLPT.resizes, 1)
+            self.assertEqual(lpt.table_size, 3079)
+            self.assertEqual(len(lpt), 1000)
+            self.assertEqual(dict(zip(lpt.keys(), lpt.values())), dict(items))
+
+        # Updates existing keys and adds new ones; the last value for a repeated key wins.
+        lpt = LinearProbeTable.from_items([("a", 1), ("b", 2)], fast_hash=True)
+        lpt.update({"b": 3, "c": 4}.items())
+        lpt.update([("d", 5), ("d", 6)])
+        self.assertEqual(dict(zip(lpt.keys(), lpt.values())), {"a": 1, "b": 3, "c": 4, "d": 6})
+        self.assertEqual(len(lpt), 4)
+
+        pairs = [((f"key{i % 50}", f"computer-{i}"), i) for i in range(1000)]
+        for strategy in STRATEGIES:
+            dt = DoubleKeyTable.from_items(pairs, probing=strategy)
+            self.assertEqual(len(dt), 50)
+            self.assertEqual(dt.table_size, 193)
+            self.assertEqual(dt["key7", "computer-57"], 57)
+            self.assertEqual(set(dt.keys("key7")), {f"computer-{i}" for i in range(7, 1000, 50)})
+            dt.update([(("key7", "computer-57"), -1), (("new", "x"), 0)])
+            self.assertEqual(dt["key7", "computer-57"], -1)
+            self.assertEqual(dt["new", "x"], 0)
+            self.assertEqual(len(dt), 51)
+
+    @number("7.6")
+    def test_rehash_bypasses_setter(self):
+        from data_structures.probing import STRATEGIES
+
+        class CountingLPT(LinearProbeTable):
+            probes = 0
+            def _linear_probe(self, key, is_insert):
+                CountingLPT.probes += 1
+                return super()._linear_probe(key, is_insert)
+
+        keys = [f"computer-{i}" for i in range(500)]
+        for fast_hash in (False, True):
+            for strategy in STRATEGIES:
+                lpt = CountingLPT(probing=strategy, fast_hash=fast_hash)
+                for i, key in enumerate(keys):
+                    lpt[key] = i
+                CountingLPT.probes = 0
+                lpt._rehash()
+                # Items are placed directly, without probing for existing keys.
+                self.assertEqual(CountingLPT.probes, 0)
+                self.assertEqual(len(lpt), len(keys))
+                for i, key in enumerate(keys):
+                    self.assertEqual(lpt[key], i)
+
+    @number("7.7")
+    def test_max_load_per_strategy(self):
+        import random
+        from data_structures.probing import STRATEGIES, QUADRATIC
+        from double_key_table import DoubleKeyTable
+
+        # Quadratic probing only reaches half the slots, so it cannot be filled to 0.9.
+        self.assertRaises(ValueError, lambda: LinearProbeTable(probing=QUADRATIC, max_load=0.9))
+        self.assertRaises(ValueError, lambda: DoubleKeyTable(probing=QUADRATIC, max_load=0.9))
+
+        rng = random.Random(14)
+        for strategy in STRATEGIES:
+            max_load = min(0.9, strategy.MAX_LOAD)
+            lpt = LinearProbeTable(probing=strategy, max_load=max_load)
+            dt = DoubleKeyTable(probing=strategy, max_load=max_load)
+            expected = {}
+            for i in range(3000):
+                key = f"computer-{rng.randrange(400)}"
+                if key in expected and rng.random() < 0.4:
+                    del expected[key], lpt[key], dt[key, key[-1]]
+                else:
+                    expected[key] = lpt[key] = dt[key, key[-1]] = i
+            self.assertEqual(dict(zip(lpt.keys(), lpt.values())), expected)
+            self.assertEqual({key: dt[key, key[-1]] for key in expected}, expected)
+            self.assertEqual(len(dt), len(expected))
+
+        # Internal tables of non-prime size can run out of probe positions below MAX_LOAD.
+        # They grow and the key pair goes into the slot found after growing.
+        dt = DoubleKeyTable(internal_sizes=[4, 53, 97, 193], probing=QUADRATIC)
+        expected = {}
+        for i in range(200):
+            key = (f"k{rng.randrange(3)}", f"computer-{rng.randrange(100)}")
+            expected[key] = dt[key] = i
+        for key, value in expected.items():
+            self.assertEqual(dt[key], value)
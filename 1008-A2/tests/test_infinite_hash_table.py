@@ -4,6 +4,21 @@ from ed_utils.decorators import number
 from infinite_hash_table import InfiniteHashTable
 
 
+def _alias_distinct_keys(rng, extra=()) -> list[str]:
+    """
+    Random keys heavy in aliasing characters ("a", "G" and "-" share a slot, as do "b" and "H"),
+    followed by extra and by random lowercase keys.
+    Keys aliasing at every position cannot be told apart, so only the first of each is kept.
+    """
+    candidates = ["".join(rng.choice("abGH-") for _ in range(rng.randint(1, 6))) for _ in range(300)]
+    candidates += extra
+    candidates += ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(1, 8))) for _ in range(500)]
+    distinct = {}
+    for key in candidates:
+        distinct.setdefault(tuple(ord(c) % 26 for c in key), key)
+    return list(distinct.values())
+
+
 class TestInfiniteHash(unittest.TestCase):
 
     @number("4.1")
@@ -92,3 +107,190 @@ class TestInfiniteHash(unittest.TestCase):
             "mining"
         ]
         self.assertListEqual(res, expected)
+
+    @number("4.4")
+    def test_iter_sorted_keys(self):
+        import random
+        import types
+
+        ih = InfiniteHashTable()
+        for i, key in enumerate(["lin", "leg", "mine", "linked", "limp", "mining", "jake", "linger"]):
+            ih[key] = i
+        self.assertIsInstance(ih.iter_sorted_keys(), types.GeneratorType)
+        it = ih.iter_sorted_keys()
+        self.assertEqual([next(it), next(it)], ["jake", "leg"])
+
+        keys = _alias_distinct_keys(random.Random(0))
+        ih = InfiniteHashTable()
+        for key in keys:
+            ih[key] = 0
+        self.assertEqual(ih.sort_keys(), sorted(keys))
+
+    @number("4.5")
+    def test_prefix_and_range(self):
+        import random
+
+        rng = random.Random(1)
+        racks = [f"rack-{rng.randint(0, 99)}-{rng.choice('abcxyz')}{rng.randint(0, 999)}" for _ in range(500)]
+        keys = sorted(_alias_distinct_keys(rng, racks))
+        ih = InfiniteHashTable()
+        for key in keys:
+            ih[key] = 0
+
+        for prefix in ["", "a", "G", "ab", "aG", "rack-", "rack-1", "rack-42-x", "zzzzzzzzz", "q", keys[10], keys[10] + "!"]:
+            expected = [key for key in keys if key.startswith(prefix)]
+            self.assertEqual(list(ih.iter_prefix(prefix)), expected, prefix)
+            self.assertEqual(ih.count_prefix(prefix), len(expected), prefix)
+
+        bounds = [None, "", "a", "G", "Ha", "b", "rack-", "rack-5", "rack-50-b", "rack-7", "zz"] + rng.sample(keys, 5)
+        for lo in bounds:
+            for hi in bounds:
+                expected = [key for key in keys if (lo is None or key >= lo) and (hi is None or key < hi)]
+                self.assertEqual(list(ih.iter_range(lo, hi)), expected, (lo, hi))
+
+        # The table reached by a prefix knows its size.
+        ih = InfiniteHashTable()
+        for i, key in enumerate(["lin", "leg", "mine", "linked", "limp", "mining", "jake", "linger"]):
+            ih[key] = i
+        self.assertEqual(ih.count_prefix("li"), 4)
+        self.assertEqual(ih.count_prefix("lin"), 3)
+        self.assertEqual(list(ih.iter_prefix("min")), ["mine", "mining"])
+        self.assertEqual(list(ih.iter_range("lim", "linh")), ["limp", "lin", "linger"])
+
+        # "-" and "a" alias, so the "A" table under them holds keys starting "-A" and "aA".
+        ih = InfiniteHashTable()
+        for i, key in enumerate(["-A-", "-AGgagA", "aAgGa", "-AgggG", "-AzG0"]):
+            ih[key] = i
+        self.assertEqual(list(ih.iter_prefix("-A")), ["-A-", "-AGgagA", "-AgggG", "-AzG0"])
+        self.assertEqual(ih.count_prefix("-A"), 4)
+
+    @number("4.6")
+    def test_delete_collapse(self):
+        import random
+
+        def tables(table):
+            for item in table.array:
+                if isinstance(item, InfiniteHashTable):
+                    yield item
+                    yield from tables(item)
+
+        rng = random.Random(3)
+        keys = [f"rack{rng.randint(0, 999):03d}-{rng.choice('xy')}" for _ in range(3000)]
+        ih = InfiniteHashTable()
+        for key in keys:
+            # Repeated keys update the value without changing the counts.
+            ih[key] = 0
+        live = set(keys)
+        self.assertEqual(len(ih), len(live))
+        for key in keys[:2800]:
+            if key in live:
+                del ih[key]
+                live.discard(key)
+        self.assertEqual(len(ih), len(live))
+        self.assertEqual(ih.sort_keys(), sorted(live))
+        for table in tables(ih):
+            # Every sub-table holds at least two keys, and knows where it is.
+            self.assertGreaterEqual(len(table), 2)
+            self.assertEqual(len(table), sum(1 for _ in table._iter_keys()))
+            self.assertIs(table.parent.array[table.parent_index], table)
+            self.assertEqual(table.occupied, sum(1 << i for i in range(table.TABLE_SIZE) if table.array[i] is not None))
+
+        # Collapsing carries on all the way up.
+        ih = InfiniteHashTable()
+        ih["server-rack-0001"] = 1
+        ih["server-rack-0002"] = 2
+        self.assertEqual(len(ih.get_location("server-rack-0001")), 16)
+        del ih["server-rack-0002"]
+        self.assertEqual(ih.get_location("server-rack-0001"), [ord("s") % 26])
+        self.assertEqual(list(tables(ih)), [])
+
+    @number("4.7")
+    def test_compressed(self):
+        import random
+
+        rng = random.Random(4)
+        racks = [f"server-rack-{rng.randint(0, 9999):04d}{rng.choice(['', '-a', '-b', '/GH'])}" for _ in range(1000)]
+        keys = _alias_distinct_keys(rng, racks)
+        rng.shuffle(keys)
+        plain = InfiniteHashTable()
+        ih = InfiniteHashTable(compressed=True)
+        for i, key in enumerate(keys):
+            plain[key] = i
+            ih[key] = i
+        self.assertEqual(len(ih), len(keys))
+        for i, key in enumerate(keys):
+            self.assertEqual(ih[key], i)
+            self.assertLessEqual(len(ih.get_location(key)), len(plain.get_location(key)))
+        self.assertEqual(ih.sort_keys(), sorted(keys))
+
+        for key in keys[:len(keys) // 2]:
+            del ih[key]
+        live = sorted(keys[len(keys) // 2:])
+        self.assertEqual(len(ih), len(live))
+        self.assertEqual(ih.sort_keys(), live)
+        self.assertRaises(KeyError, lambda: ih[keys[0]])
+        for prefix in ["", "a", "G", "aG", "server-", "server-rack-1", "server-rack-12", "server-rack-0123/G", "q"]:
+            expected = [key for key in live if key.startswith(prefix)]
+            self.assertEqual(list(ih.iter_prefix(prefix)), expected, prefix)
+            self.assertEqual(ih.count_prefix(prefix), len(expected), prefix)
+        for lo, hi in [(None, None), ("a", "b"), ("server-rack-2", "server-rack-35"), ("G", None), (None, "server-rack-05")]:
+            expected = [key for key in live if (lo is None or key >= lo) and (hi is None or key < hi)]
+            self.assertEqual(list(ih.iter_range(lo, hi)), expected, (lo, hi))
+
+        # Shared runs of characters are skipped, and split again when a key leaves them.
+        ih = InfiniteHashTable(compressed=True)
+        ih["server-rack-0001"] = 1
+        ih["server-rack-0002"] = 2
+        self.assertEqual(ih.get_location("server-rack-0001"), [ord("s") % 26, ord("1") % 26])
+        ih["serpent"] = 3
+        self.assertEqual(ih.get_location("serpent"), [ord("s") % 26, ord("p") % 26])
+        self.assertEqual(ih.get_location("server-rack-0002"), [ord("s") % 26, ord("v") % 26, ord("2") % 26])
+        del ih["serpent"]
+        self.assertEqual(ih.get_location("server-rack-0002"), [ord("s") % 26, ord("2") % 26])
+        self.assertEqual(ih.sort_keys(), ["server-rack-0001", "server-rack-0002"])
+
+    @number("4.8")
+    def test_sparse(self):
+        import random
+
+        def tables(table):
+            yield table
+            for item in table.array or ():
+                if isinstance(item, InfiniteHashTable):
+                    yield from tables(item)
+
+        rng = random.Random(5)
+        keys = _alias_distinct_keys(rng, [f"server-rack-{rng.randint(0, 9999):04d}" for _ in range(500)])
+        for compressed in (False, True):
+            plain = InfiniteHashTable(compressed=compressed)
+            ih = InfiniteHashTable(compressed=compressed, sparse=True)
+            for i, key in enumerate(keys):
+                plain[key] = i
+                ih[key] = i
+            for key in keys[::3]:
+                del plain[key]
+                del ih[key]
+            live = [key for key in keys if key in plain]
+            self.assertEqual(len(ih), len(live))
+            for key in live:
+                # Same slots as the full layout, stored densely.
+                self.assertEqual(ih.get_location(key), plain.get_location(key))
+                self.assertEqual(ih[key], plain[key])
+            self.assertRaises(KeyError, lambda: ih[keys[0]])
+            self.assertEqual(ih.sort_keys(), sorted(live))
+            self.assertEqual(list(ih.iter_prefix("server-rack-1")), list(plain.iter_prefix("server-rack-1")))
+            for table in tables(ih):
+                self.assertEqual(len(table.array), table.occupied.bit_count())
+
+        ih = InfiniteHashTable(sparse=True)
+        self.assertIsNone(ih.array)
+        ih["lin"] = 1
+        ih["leg"] = 2
+        ih["mine"] = 3
+        self.assertEqual(ih.get_location("leg"), [4, 23])
+        self.assertEqual(len(ih.array), 2)
+        del ih["mine"]
+        del ih["lin"]
+        del ih["leg"]
+        self.assertIsNone(ih.array)
+        self.assertEqual(len(ih), 0)
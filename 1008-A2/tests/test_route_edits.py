@@ -113,3 +113,42 @@ class TestRouteMethods(unittest.TestCase):
         self.assertIsInstance(res, RouteSeries)
         self.assertEqual(res.computer, m)
         self.assertEqual(res.following.store, None)
+
+    @number("1.5")
+    def test_edit_at_path(self):
+        a, b, c, d, e = (Computer(letter, 5, 5, 1.0) for letter in "abcde")
+        bottom = Route(RouteSeries(c, Route(None)))
+        t = Route(RouteSeries(a, Route(RouteSplit(
+            Route(RouteSeries(b, Route(RouteSeries(d, Route(None))))),
+            bottom,
+            Route(None),
+        ))))
+
+        path = ["following", "top", "following"]
+        self.assertEqual(t.route_at(path).store.computer, d)
+
+        res1 = t.add_computer_at(path, e)
+        self.assertEqual(res1.add_all_computers(), [a, b, e, d, c])
+        # The original route is untouched and untouched branches are shared.
+        self.assertEqual(t.add_all_computers(), [a, b, d, c])
+        self.assertIs(res1.route_at(["following", "bottom"]), bottom)
+        self.assertIs(res1.route_at(path + ["following"]), t.route_at(path))
+
+        res2 = t.remove_at(["following", "top"])
+        self.assertEqual(res2.add_all_computers(), [a, d, c])
+
+        res3 = t.remove_at(["following"])
+        self.assertEqual(res3.add_all_computers(), [a])
+
+        res4 = t.replace_computer_at(["following", "bottom"], e)
+        self.assertEqual(res4.add_all_computers(), [a, b, d, e])
+
+        res5 = t.add_empty_branch_at(["following", "bottom"])
+        self.assertIsInstance(res5.route_at(["following", "bottom"]).store, RouteSplit)
+        self.assertIs(res5.route_at(["following", "bottom", "following"]), bottom)
+
+        res6 = t.replace_at(["following", "top"], Route(None))
+        self.assertEqual(res6.add_all_computers(), [a, c])
+
+        self.assertRaises(ValueError, lambda: t.route_at(["top"]))
+        self.assertRaises(ValueError, lambda: t.remove_at(["following", "following"]))
@@ -126,3 +126,97 @@ class TestRouteMethods(unittest.TestCase):
             self.top_bot, self.top_top, self.top_mid,
             self.bot_one, self.bot_two, self.final
         ])))
+
+    @number("2.6")
+    def test_collect_long_route(self):
+        self.load_example()
+        self.assertListEqual(self.route.add_all_computers(), [
+            self.top_top, self.top_bot, self.top_mid,
+            self.bot_one, self.bot_two, self.final
+        ])
+
+        # Deeper than the recursion limit.
+        computers = [Computer(str(i), i, i, 0.1) for i in range(20000)]
+        route = Route(None)
+        for computer in reversed(computers):
+            route = route.add_computer_before(computer)
+        self.assertListEqual(route.add_all_computers(), computers)
+        self.assertIs(next(route.iter_computers()), computers[0])
+
+    @number("2.7")
+    def test_batch_simulation(self):
+        from virus_simulation import simulate
+
+        self.load_example()
+        small = self.route
+        self.large_example()
+        large = self.route
+        viruses = [TopVirus, BottomVirus, LazyVirus, RiskAverseVirus]
+
+        serial = simulate([small, large], viruses, processes=1)
+        self.assertEqual(len(serial), 8)
+        self.assertEqual(list(serial.route_indices), [0, 0, 0, 0, 1, 1, 1, 1])
+        self.assertEqual(serial.virus_names[:4], ["TopVirus", "BottomVirus", "LazyVirus", "RiskAverseVirus"])
+        route_index, name, value, length, computers = next(serial.rows())
+        self.assertEqual((route_index, name, value, length), (0, "TopVirus", 14, 3))
+        self.assertEqual([c.name for c in computers], ["top-top", "top-mid", "final"])
+
+        pooled = simulate([small, large], viruses, processes=2)
+        self.assertEqual(list(pooled.rows()), list(serial.rows()))
+
+        # Long routes are too deep to pickle as nested Routes, even under spawn.
+        import multiprocessing
+        long_route = Route(None)
+        for i in range(5000):
+            long_route = long_route.add_computer_before(Computer(f"c{i}", 1, 1, 0.1))
+        spawned = simulate([long_route, small], [TopVirus], processes=2,
+                           mp_context=multiprocessing.get_context("spawn"))
+        self.assertEqual(list(spawned.path_lengths), [5000, 3])
+        self.assertEqual(spawned.hacked_computers[0][0].name, "c4999")
+
+    @number("2.8")
+    def test_compiled_route(self):
+        from compiled_route import CompiledRoute
+
+        for example in (self.load_example, self.large_example):
+            example()
+            compiled = CompiledRoute(self.route)
+            for virus_type in (TopVirus, BottomVirus, LazyVirus, RiskAverseVirus):
+                expected, actual = virus_type(), virus_type()
+                self.route.follow_path(expected)
+                compiled.follow_path(actual)
+                self.assertListEqual(actual.computers, expected.computers)
+
+        # Shared sub-routes are compiled once.
+        shared = Route(RouteSeries(Computer("s", 1, 1, 0.1), Route(None)))
+        route = Route(RouteSplit(shared, shared, Route(None)))
+        self.assertEqual(len(CompiledRoute(route)), 4)
+
+    @number("2.9")
+    def test_fancy_virus_expressions(self):
+        from algorithms.rpn import compile_rpn, RPNExpression
+
+        self.assertEqual(compile_rpn("7 3 + 8 - 2 * 2 /").constant, 2.0)
+        self.assertIs(compile_rpn("1 2 +"), compile_rpn("1 2 +"))
+        expression = RPNExpression("top_value bottom_value + 2 /")
+        self.assertEqual(expression.variables, ("top_value", "bottom_value"))
+        self.assertEqual(expression.evaluate({"top_value": 3, "bottom_value": 5}), 4.0)
+        self.assertRaises(KeyError, lambda: expression.evaluate({"top_value": 3}))
+        for bad in ["1 +", "1 2", "1 2 ^", ""]:
+            self.assertRaises(ValueError, lambda: RPNExpression(bad))
+            self.assertRaises(ValueError, lambda: FancyVirus(bad))
+
+        self.load_example()
+        # Threshold of 4: top-bot (5) and top-top (3), so top is taken.
+        fv = FancyVirus("top_value bottom_value + 2 /")
+        self.route.follow_path(fv)
+        self.assertListEqual(fv.computers, [self.top_top, self.top_mid, self.final])
+        # Top is not below the threshold and bottom is not above it, so the virus stops.
+        route = Route(RouteSplit(
+            Route(RouteSeries(Computer("high", 1, 10, 0.1), Route(None))),
+            Route(RouteSeries(Computer("low", 1, 2, 0.1), Route(None))),
+            Route(RouteSeries(self.final, Route(None))),
+        ))
+        fv = FancyVirus("5")
+        route.follow_path(fv)
+        self.assertListEqual(fv.computers, [])
@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from computer import Computer
 from route import Route, RouteSeries, RouteSplit
 from branch_decision import BranchDecision
+from algorithms.rpn import compile_rpn
 
 
 class VirusType(ABC):
@@ -134,49 +135,61 @@ class RiskAverseVirus(VirusType):
             return BranchDecision.TOP
 
 
-class FancyVirus(VirusType): #TODO
+class FancyVirus(VirusType):
     CALC_STR = "7 3 + 8 - 2 * 2 /"
 
+    def __init__(self, calc_str: str | None = None) -> None:
+        """
+        calc_str: RPN expression for the threshold, overriding CALC_STR for this virus.
+                  It may use the variables top_value, top_difficulty, top_risk,
+                  bottom_value, bottom_difficulty and bottom_risk of the two candidate computers.
+        :raises ValueError: when the expression is malformed.
+        """
+        super().__init__()
+        self.calc_str = calc_str
+        self.expression = compile_rpn(calc_str if calc_str is not None else self.CALC_STR)
+
+    def threshold(self, top_comp: Computer, bot_comp: Computer) -> float:
+        """
+        Evaluates the threshold expression compiled when the virus was built.
+        A virus using the class default recompiles it only if CALC_STR was reassigned since.
+        """
+        expression = self.expression
+        if self.calc_str is None and expression.expression != self.CALC_STR:
+            expression = self.expression = compile_rpn(self.CALC_STR)
+        if not expression.variables:
+            return expression.constant
+        return expression.evaluate({
+            "top_value": top_comp.hacked_value,
+            "top_difficulty": top_comp.hacking_difficulty,
+            "top_risk": top_comp.risk_factor,
+            "bottom_value": bot_comp.hacked_value,
+            "bottom_difficulty": bot_comp.hacking_difficulty,
+            "bottom_risk": bot_comp.risk_factor,
+        })
+
     def select_branch(self, top_branch: Route, bottom_branch: Route) -> BranchDecision:
         """
         Selects the branch based on the evaluated threshold from the RPN expression and compares it against
         the hacked values of computers on each branch.
         """
-        #I have written this code, it has the right logic but it has a bug, I'm trying to figure it out
-        # Direct evaluation of the RPN expression
-        tokens = self.CALC_STR.split()
-        #I also used stack, just don't forget to import stack file on your code:)
-        Stack = []
-        for token in tokens:
-            if token.isdigit():
-                Stack.append(float(token))
-            else:
-                b = Stack.pop()
-                a = Stack.pop()
-                if token == '+':
-                    Stack.append(a + b)
-                elif token == '-':
-                    Stack.append(a - b)
-                elif token == '*':
-                    Stack.append(a * b)
-                elif token == '/':
-                    Stack.append(a / b)
-
-        threshold = Stack.pop()  # Result of the RPN calculation
-        #check wheather both routes contain computer 
+        #check wheather both routes contain computer
         top_route = type(top_branch.store) == RouteSeries
         bot_route = type(bottom_branch.store) == RouteSeries
         if top_route and bot_route:
-            if top_branch.store.computer.hacked_value < threshold:
+            top_comp = top_branch.store.computer
+            bot_comp = bottom_branch.store.computer
+            threshold = self.threshold(top_comp, bot_comp)
+            if top_comp.hacked_value < threshold:
                 return BranchDecision.TOP
-            if bottom_branch.store.computer.hacked_value > threshold:
+            if bot_comp.hacked_value > threshold:
                 return BranchDecision.BOTTOM
             else:
-                BranchDecision.STOP
+                return BranchDecision.STOP
 
         elif top_route and not bot_route:
             return BranchDecision.BOTTOM
         elif not top_route and bot_route:
             return BranchDecision.TOP
         else:
-            return BranchDecision.TOP
\ No newline at end of file
+            return BranchDecision.TOP
@@ -0,0 +1,121 @@
+from __future__ import annotations
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.context import BaseContext
+from typing import Callable, Iterator, Sequence
+
+from compiled_route import CompiledRoute
+from computer import Computer
+from route import Route
+from virus import VirusType
+
+VirusFactory = Callable[[], VirusType]
+
+# Routes and virus factories of the current worker process, set by _init_worker.
+_worker_routes: Sequence[Route | CompiledRoute] = ()
+_worker_factories: Sequence[VirusFactory] = ()
+
+
+@dataclass
+class SimulationTable:
+    """
+    Results of a batch simulation, one row per (route, virus) pair.
+
+    Rows are ordered by route index, then by virus index, regardless of how
+    the simulations were scheduled, so results are reproducible.
+    """
+
+    route_indices: array = field(default_factory=lambda: array("l"))
+    virus_indices: array = field(default_factory=lambda: array("l"))
+    virus_names: list[str] = field(default_factory=list)
+    hacked_values: array = field(default_factory=lambda: array("q"))
+    path_lengths: array = field(default_factory=lambda: array("l"))
+    hacked_computers: list[list[Computer]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.route_indices)
+
+    def append(self, route_index: int, virus_index: int, virus_name: str, computers: list[Computer]) -> None:
+        self.route_indices.append(route_index)
+        self.virus_indices.append(virus_index)
+        self.virus_names.append(virus_name)
+        self.hacked_values.append(sum(computer.hacked_value for computer in computers))
+        self.path_lengths.append(len(computers))
+        self.hacked_computers.append(computers)
+
+    def rows(self) -> Iterator[tuple[int, str, int, int, list[Computer]]]:
+        """
+        Yields (route_index, virus_name, hacked_value, path_length, hacked_computers) rows.
+        """
+        return zip(self.route_indices, self.virus_names, self.hacked_values, self.path_lengths, self.hacked_computers)
+
+
+def simulate(
+    routes: Sequence[Route],
+    virus_types: Sequence[VirusFactory],
+    processes: int | None = None,
+    chunksize: int | None = None,
+    mp_context: BaseContext | None = None,
+) -> SimulationTable:
+    """
+    Follows every route with a fresh virus from every factory (usually VirusType subclasses).
+
+    processes: number of worker processes, None for one per CPU.
+               With processes=1 everything runs in the calling process.
+    chunksize: number of (route, virus) pairs sent to a worker at a time.
+    mp_context: multiprocessing context for the workers, None for the platform default.
+
+    When run in worker processes the hacked computers returned are copies of those on the route,
+    and factories must be picklable (module-level classes, not lambdas).
+    Routes are sent to workers as CompiledRoutes, which pickle without recursion
+    however long the route is, so any start method (fork, spawn, forkserver) works.
+
+    :complexity: O(R * V * P) where R is len(routes), V is len(virus_types)
+                 and P is the cost of following a single path.
+    """
+    pairs = [(r, v) for r in range(len(routes)) for v in range(len(virus_types))]
+    if processes == 1 or len(pairs) <= 1:
+        _init_worker(routes, virus_types)
+        try:
+            return _collect(pairs, map(_run_pair, pairs), virus_types)
+        finally:
+            _init_worker((), ())
+
+    compiled = [CompiledRoute(route) for route in routes]
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=mp_context,
+        initializer=_init_worker,
+        initargs=(compiled, virus_types),
+    ) as executor:
+        if chunksize is None:
+            workers = processes or os.cpu_count() or 1
+            chunksize = max(1, len(pairs) // (workers * 4))
+        # Executor.map yields results in submission order, keeping the table deterministic.
+        return _collect(pairs, executor.map(_run_pair, pairs, chunksize=chunksize), virus_types)
+
+
+def _collect(pairs: list[tuple[int, int]], results, virus_types: Sequence[VirusFactory]) -> SimulationTable:
+    table = SimulationTable()
+    for (route_index, virus_index), computers in zip(pairs, results):
+        name = getattr(virus_types[virus_index], "__name__", repr(virus_types[virus_index]))
+        table.append(route_index, virus_index, name, computers)
+    return table
+
+
+def _init_worker(routes: Sequence[Route | CompiledRoute], virus_types: Sequence[VirusFactory]) -> None:
+    """
+    Stores the routes and factories once per worker, so each task only sends two indices.
+    """
+    global _worker_routes, _worker_factories
+    _worker_routes = routes
+    _worker_factories = virus_types
+
+
+def _run_pair(pair: tuple[int, int]) -> list[Computer]:
+    route_index, virus_index = pair
+    virus = _worker_factories[virus_index]()
+    _worker_routes[route_index].follow_path(virus)
+    return virus.computers